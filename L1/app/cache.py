@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import date
+from typing import Any, Dict, Optional
+
+# Константы
+CACHE_DIR = "cache"
+RECENT_TTL = 0  # Сколько секунд считать свежим ответ за сегодняшнюю и будущие даты
+
+
+class ResponseCache:
+    """
+    Дисковый кэш ответов архива ЦБ.
+
+    Каждая запись хранится в отдельном JSON-файле, имя которого — SHA-256
+    от адреса запроса. Запись содержит тело ответа, код состояния и
+    валидаторы ETag/Last-Modified для условных запросов. Файлы пишутся
+    во временный файл и подменяются через os.replace, поэтому читатель
+    всегда видит либо старую, либо новую запись целиком.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, immutable_ttl: Optional[float] = None,
+                 recent_ttl: float = RECENT_TTL):
+        """
+        :param directory: Директория кэша.
+        :param immutable_ttl: Время жизни записей за прошедшие дни в секундах
+            (None — записи не устаревают, архив за прошлые дни не меняется).
+        :param recent_ttl: Время жизни записей за сегодняшний и будущие дни.
+        """
+        self.directory = directory
+        self.immutable_ttl = immutable_ttl
+        self.recent_ttl = recent_ttl
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Возвращает запись для адреса или None, если ее нет или она повреждена."""
+        try:
+            with open(self._path(url), encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def put(self, url: str, status: int, payload: Any = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Атомарно сохраняет ответ в кэш."""
+        entry = {
+            "url": url,
+            "status": status,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+            "payload": payload,
+        }
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def is_fresh(self, entry: Dict[str, Any], day: date) -> bool:
+        """
+        Проверяет, можно ли использовать запись без обращения к серверу.
+
+        Неизменной считается только запись, сохраненная после окончания
+        своего дня. Ответ, полученный за сегодняшний день (например, 404,
+        пока курс еще не опубликован), и на следующий день остается
+        «недавним» и перепроверяется, пока не будет сохранен заново.
+        """
+        stored_day = date.fromtimestamp(entry["stored_at"])
+        ttl = self.immutable_ttl if day < min(stored_day, date.today()) else self.recent_ttl
+        if ttl is None:
+            return True
+        return time.time() - entry["stored_at"] < ttl
+
+    @staticmethod
+    def validators(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Возвращает заголовки условного запроса для записи."""
+        headers = {}
+        if entry and entry.get("status") == 200:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
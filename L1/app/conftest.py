@@ -0,0 +1,82 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Дни, для которых заглушка архива возвращает данные
+RATES = {
+    "2024/10/01": 92.9,
+    "2024/10/02": 93.3581,
+    "2024/10/03": 94.5054,
+    "2024/10/04": 95.0262,
+}
+
+
+class StubArchiveHandler(BaseHTTPRequestHandler):
+    """
+    Заглушка cbr-xml-daily.ru: отдает daily_json.js для дней из RATES, иначе 404.
+
+    В server.failures можно задать для даты список кодов ошибок, которые
+    будут возвращены по одному перед успешным ответом.
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            date_str = self.path.removeprefix("/archive/").removesuffix("/daily_json.js")
+            with server.lock:
+                failures = server.failures.get(date_str)
+                status = failures.pop(0) if failures else None
+            if status is not None:
+                self.send_response(status)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if date_str not in RATES:
+                self.send_error(404)
+                return
+            etag = f'"{date_str}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = json.dumps({"Valute": {"USD": {"Value": RATES[date_str]}}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/javascript")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Фикстура для запуска локального сервера вместо архива ЦБ."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubArchiveHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.delay = 0.05
+    server.failures = {}
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/archive/"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,30 @@
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+# Константы
+DATE_COLUMN = "Дата"
+RATE_COLUMN_PREFIX = "Курс "
+
+
+def rate_column(currency_code: str) -> str:
+    """Возвращает название столбца с курсом валюты, например 'Курс USD'."""
+    return f"{RATE_COLUMN_PREFIX}{currency_code}"
+
+
+def rates_to_frame(data: Dict[str, Dict[str, float]],
+                   currency_codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Преобразует загруженные курсы в широкую таблицу: одна строка на дату,
+    один столбец на валюту.
+
+    :param data: Словарь {дата: {код валюты: курс}}.
+    :param currency_codes: Порядок столбцов (None — все валюты по алфавиту).
+    :return: DataFrame со столбцами 'Дата', 'Курс <код>', ...
+    """
+    if currency_codes is None:
+        currency_codes = sorted({code for rates in data.values() for code in rates})
+
+    df = pd.DataFrame.from_dict(data, orient="index", columns=list(currency_codes))
+    df.columns = [rate_column(code) for code in df.columns]
+    df.index.name = DATE_COLUMN
+    return df.reset_index()
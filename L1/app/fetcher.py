@@ -0,0 +1,182 @@
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from requests.adapters import HTTPAdapter
+
+from cache import ResponseCache
+from scheduler import FetchScheduler
+
+# Константы
+BASE_URL = "https://www.cbr-xml-daily.ru/archive/"
+CURRENCY_CODES = ('USD',)  # Коды валют по умолчанию
+DATE_FORMAT = '%Y/%m/%d'
+DEFAULT_MAX_WORKERS = 16  # Максимальное число одновременных запросов
+REQUEST_TIMEOUT = 10  # Таймаут одного запроса в секундах
+
+
+def build_date_range(days: int, end_date: Optional[date] = None) -> List[date]:
+    """
+    Формирует список дат за последние несколько дней, начиная с самой новой.
+
+    :param days: Количество дней.
+    :param end_date: Последняя дата диапазона (по умолчанию — сегодня).
+    :return: Список дат в порядке убывания.
+    """
+    end_date = end_date or date.today()
+    return [end_date - timedelta(days=days_ago) for days_ago in range(days)]
+
+
+def build_url(day: date, base_url: str = BASE_URL) -> str:
+    """Возвращает адрес архивного файла daily_json.js для указанной даты."""
+    return f"{base_url}{day.strftime(DATE_FORMAT)}/daily_json.js"
+
+
+def create_session(max_workers: int = DEFAULT_MAX_WORKERS) -> requests.Session:
+    """
+    Создает HTTP-сессию с пулом соединений, рассчитанным на max_workers потоков.
+
+    Все запросы идут на один хост, поэтому соединения переиспользуются
+    между днями вместо нового TCP/TLS-рукопожатия на каждый запрос.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_payload(session: requests.Session, day: date, base_url: str = BASE_URL,
+                cache: Optional[ResponseCache] = None,
+                throttle: Optional[Callable[[], None]] = None) -> Any:
+    """
+    Возвращает разобранный daily_json.js за день, по возможности из кэша.
+
+    Свежая запись кэша возвращается без обращения к серверу. Для устаревшей
+    записи отправляется условный запрос, и ответ 304 продлевает ее.
+    Функция throttle вызывается только перед сетевым запросом.
+
+    :raises requests.exceptions.HTTPError: при ошибочном коде ответа.
+    """
+    url = build_url(day, base_url)
+    entry = cache.get(url) if cache is not None else None
+
+    if entry is not None and cache.is_fresh(entry, day):
+        if entry["status"] != HTTPStatus.OK:
+            cached_response = requests.Response()
+            cached_response.status_code = entry["status"]
+            raise requests.exceptions.HTTPError(f"{entry['status']} (из кэша) for url: {url}",
+                                                response=cached_response)
+        return entry["payload"]
+
+    if throttle is not None:
+        throttle()
+    response = session.get(url, headers=ResponseCache.validators(entry), timeout=REQUEST_TIMEOUT)
+
+    if response.status_code == HTTPStatus.NOT_MODIFIED and entry is not None:
+        cache.put(url, entry["status"], entry["payload"], entry["etag"], entry["last_modified"])
+        return entry["payload"]
+
+    if cache is not None and response.status_code == HTTPStatus.NOT_FOUND:
+        # Выходные и праздники: запоминаем отсутствие данных, чтобы не спрашивать повторно
+        cache.put(url, response.status_code)
+    response.raise_for_status()  # Поднимает исключение при ошибках HTTP
+
+    payload = response.json()
+    if cache is not None:
+        cache.put(url, response.status_code, payload,
+                  response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return payload
+
+
+def extract_rates(data: Dict[str, Any], currency_codes: Optional[Sequence[str]] = None) -> Dict[str, float]:
+    """
+    Извлекает курсы нескольких валют за один проход по ответу архива.
+
+    :param data: Разобранный daily_json.js.
+    :param currency_codes: Коды валют (None — все валюты из ответа).
+    :return: Словарь {код валюты: курс} только для найденных валют.
+    """
+    valute = data.get('Valute') or {}
+    if currency_codes is None:
+        return {code: info['Value'] for code, info in valute.items()}
+    return {code: valute[code]['Value'] for code in currency_codes if code in valute}
+
+
+def fetch_day(session: requests.Session, day: date, base_url: str = BASE_URL,
+              currency_codes: Optional[Sequence[str]] = CURRENCY_CODES,
+              cache: Optional[ResponseCache] = None,
+              scheduler: Optional[FetchScheduler] = None) -> Optional[Dict[str, float]]:
+    """
+    Загружает курсы валют за один день.
+
+    Если передан планировщик, запрос проходит через его ограничение
+    частоты и повторы, а окончательный сбой попадает в его журнал.
+
+    :param session: HTTP-сессия.
+    :param day: Дата.
+    :param base_url: Базовый адрес архива.
+    :param currency_codes: Коды валют (None — все валюты).
+    :param cache: Кэш ответов (необязательно).
+    :param scheduler: Планировщик запросов (необязательно).
+    :return: Словарь {код валюты: курс} или None, если данных нет.
+    """
+    date_str = day.strftime(DATE_FORMAT)
+    try:
+        if scheduler is not None:
+            data = scheduler.run(lambda: get_payload(session, day, base_url, cache, scheduler.throttle), day)
+        else:
+            data = get_payload(session, day, base_url, cache)
+        rates = extract_rates(data, currency_codes)
+        if not rates:
+            print(f"Данные за {date_str} отсутствуют или некорректны.")
+            return None
+
+        return rates
+
+    except requests.exceptions.HTTPError as http_err:
+        print(f"HTTP ошибка: {http_err} ({date_str})")
+    except requests.exceptions.RequestException as req_err:
+        print(f"Ошибка запроса: {req_err} ({date_str})")
+    except Exception as e:
+        print(f"Ошибка: {e} ({date_str})")
+    return None
+
+
+def fetch_rates(days: Iterable[date], max_workers: int = DEFAULT_MAX_WORKERS,
+                base_url: str = BASE_URL, currency_codes: Optional[Sequence[str]] = CURRENCY_CODES,
+                cache: Optional[ResponseCache] = None,
+                scheduler: Optional[FetchScheduler] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Параллельно загружает курсы валют за несколько дней.
+
+    Ответы собираются по мере готовности, но итоговый словарь упорядочен
+    так же, как входной список дат. Каждый ответ скачивается один раз
+    независимо от числа запрошенных валют.
+
+    :param days: Даты для загрузки.
+    :param max_workers: Максимальное число одновременных запросов.
+    :param base_url: Базовый адрес архива.
+    :param currency_codes: Коды валют (None — все валюты).
+    :param cache: Кэш ответов (необязательно).
+    :param scheduler: Планировщик запросов (необязательно).
+    :return: Словарь {дата 'YYYY/MM/DD': {код валюты: курс}} только для дней с данными.
+    """
+    days = list(days)
+    results = {}
+
+    with create_session(max_workers) as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch_day, session, day, base_url, currency_codes, cache, scheduler): day
+            for day in days
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    return {
+        day.strftime(DATE_FORMAT): results[day]
+        for day in days
+        if results.get(day) is not None
+    }
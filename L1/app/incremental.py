@@ -0,0 +1,105 @@
+import os
+import pandas as pd
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dataset import DATE_COLUMN, rate_column, rates_to_frame
+
+# Константы
+CSV_SEP = ';'
+CSV_ENCODING = 'utf-8-sig'
+DATE_FORMAT = '%Y/%m/%d'
+
+
+def read_existing(filename: str) -> Optional[pd.DataFrame]:
+    """
+    Читает уже сохраненный CSV-файл без преобразования типов.
+
+    Все значения читаются как строки, поэтому при повторной записи
+    нетронутые строки сохраняются без изменений.
+
+    :param filename: Путь к CSV-файлу.
+    :return: DataFrame или None, если файла нет или он пуст.
+    """
+    if not os.path.exists(filename):
+        return None
+    df = pd.read_csv(filename, sep=CSV_SEP, encoding=CSV_ENCODING, dtype=str, keep_default_na=False)
+    if df.empty or DATE_COLUMN not in df:
+        return None
+    return df
+
+
+def covered_range(existing: pd.DataFrame) -> Tuple[date, date]:
+    """
+    Возвращает диапазон дат, уже покрытый файлом.
+
+    Пропуски внутри диапазона — выходные и праздники, за которые архив
+    не публикует курс, поэтому повторно их не запрашиваем.
+    """
+    dates = pd.to_datetime(existing[DATE_COLUMN], format=DATE_FORMAT)
+    return dates.min().date(), dates.max().date()
+
+
+def select_missing_days(days: Iterable[date], existing: Optional[pd.DataFrame],
+                        currency_codes: Optional[Sequence[str]] = None) -> List[date]:
+    """
+    Отбирает даты, которых нет в покрытом файлом диапазоне.
+
+    :param days: Все даты, которые должны быть в наборе данных.
+    :param existing: Содержимое текущего файла (или None).
+    :param currency_codes: Запрошенные валюты. Если в файле нет столбца
+        для какой-либо из них, загружаются все даты.
+    :return: Более новые или более старые даты, чем уже сохраненные.
+    """
+    days = list(days)
+    if existing is None:
+        return days
+    if currency_codes and any(rate_column(code) not in existing for code in currency_codes):
+        return days
+    first, last = covered_range(existing)
+    return [day for day in days if day > last or day < first]
+
+
+def merge_rates(existing: Optional[pd.DataFrame], new_data: Dict[str, Dict[str, float]],
+                currency_codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Объединяет сохраненные строки с новыми курсами.
+
+    Новые значения заменяют строки с той же датой, итоговая таблица
+    упорядочена от новой даты к старой, как и при полной загрузке.
+    Столбцы новых валют добавляются справа, пропуски остаются пустыми.
+    """
+    new_rows = rates_to_frame(new_data, currency_codes)
+    new_rows = new_rows.astype(str).where(new_rows.notna(), "")
+    if existing is None:
+        merged = new_rows
+    else:
+        columns = list(existing.columns) + [col for col in new_rows.columns if col not in existing]
+        merged = pd.concat([new_rows, existing], ignore_index=True)[columns].fillna("")
+        merged = merged.drop_duplicates(subset=DATE_COLUMN, keep="first")
+
+    order = pd.to_datetime(merged[DATE_COLUMN], format=DATE_FORMAT).sort_values(ascending=False, kind="stable")
+    return merged.loc[order.index].reset_index(drop=True)
+
+
+def save_incremental(new_data: Dict[str, Dict[str, float]], existing: Optional[pd.DataFrame], filename: str,
+                     currency_codes: Optional[Sequence[str]] = None) -> None:
+    """
+    Дописывает новые курсы в CSV-файл.
+
+    Файл записывается во временный файл и атомарно подменяется, чтобы
+    прерванный запуск по расписанию не испортил уже накопленную историю.
+    """
+    if not new_data:
+        print("Новых данных нет, файл не изменен.")
+        return
+
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    merged = merge_rates(existing, new_data, currency_codes)
+    tmp_filename = f"{filename}.tmp"
+    merged.to_csv(tmp_filename, sep=CSV_SEP, index=False, encoding=CSV_ENCODING)
+    os.replace(tmp_filename, filename)
+    print(f"Добавлено дней: {len(new_data)}.")
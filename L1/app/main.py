@@ -1,9 +1,13 @@
+import argparse
 import os
-import requests
-import pandas as pd
-from datetime import datetime, timedelta
 from http import HTTPStatus
 
+from cache import ResponseCache
+from dataset import rates_to_frame
+from fetcher import build_date_range, fetch_rates
+from incremental import read_existing, save_incremental, select_missing_days
+from scheduler import FetchScheduler, read_failed_days, save_failed_days
+
 # Константы
 DATA_DIR = "/data"
 FILENAME = "dataset_v3.csv"
@@ -13,6 +17,13 @@ CSV_ENCODING = 'utf-8-sig'
 DAYS_IN_YEAR = 365  # Количество дней для парсинга
 BASE_URL = "https://www.cbr-xml-daily.ru/archive/"
 CURRENCY_CODE = 'USD'  # Код валюты
+ALL_CURRENCIES = 'all'  # Значение --currencies для загрузки всех валют
+MAX_WORKERS = 16  # Количество одновременных запросов к архиву
+CACHE_DIR = os.path.join(DATA_DIR, "cache")  # Кэш ответов архива
+FAILED_DAYS_PATH = os.path.join(DATA_DIR, "failed_days.json")  # Журнал незагруженных дней
+REQUESTS_PER_SECOND = 10  # Допустимая частота запросов к архиву
+MAX_RETRIES = 5  # Количество повторов для одного дня
+RETRY_BUDGET = 100  # Общее количество повторов за запуск
 
 # Словарь основных кодов состояния HTTP
 HTTP_STATUS_MESSAGES = {
@@ -25,19 +36,20 @@ HTTP_STATUS_MESSAGES = {
 }
 
 
-def save_to_csv(data, filename=CSV_PATH):
+def save_to_csv(data, filename=CSV_PATH, currency_codes=(CURRENCY_CODE,)):
     """
     Сохраняет данные в файл CSV.
 
-    :param data: словарь с данными для сохранения (дата: курс USD)
+    :param data: словарь с данными для сохранения (дата: {код валюты: курс})
     :param filename: путь к файлу, в который сохраняются данные
+    :param currency_codes: коды валют, по столбцу на каждую (None — все)
     """
     if data:
         # Создаем директорию, если она не существует
         os.makedirs(os.path.dirname(filename), exist_ok=True)
 
         # Преобразуем данные в DataFrame
-        df = pd.DataFrame(list(data.items()), columns=["Дата", "Курс USD"])
+        df = rates_to_frame(data, currency_codes)
 
         # Сохраняем данные в CSV файл
         df.to_csv(filename, sep=CSV_SEP, index=False, encoding=CSV_ENCODING)
@@ -45,37 +57,63 @@ def save_to_csv(data, filename=CSV_PATH):
         print("Нет данных для сохранения.")
 
 
-# Основной код программы
-if __name__ == "__main__":
-    # Словарь для хранения данных о валюте
-    currency_data = {}
-
-    # Перебираем данные за последние несколько дней (например, 365 дней)
-    for days_ago in range(DAYS_IN_YEAR):
-        date_str = (datetime.now() - timedelta(days=days_ago)).strftime('%Y/%m/%d')
-        url = f"{BASE_URL}{date_str}/daily_json.js"
-
-        try:
-            response = requests.get(url)
-            response.raise_for_status()  # Поднимает исключение при ошибках HTTP
-
-            data = response.json()
-            if 'Valute' not in data or CURRENCY_CODE not in data['Valute']:
-                print(f"Данные за {date_str} отсутствуют или некорректны.")
-                continue
-
-            usd_rate = data['Valute'][CURRENCY_CODE]['Value']
-            # Сохраняем дату и курс валюты в словарь
-            currency_data[date_str] = usd_rate
-
-        except requests.exceptions.HTTPError as http_err:
-            print(f"HTTP ошибка: {http_err} ({date_str})")
-        except requests.exceptions.RequestException as req_err:
-            print(f"Ошибка запроса: {req_err} ({date_str})")
-        except Exception as e:
-            print(f"Ошибка: {e} ({date_str})")
+def parse_args() -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Загрузка курса валюты из архива ЦБ РФ.")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="загрузить только дни, которых еще нет в CSV-файле, и дописать их",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="не использовать дисковый кэш ответов архива",
+    )
+    parser.add_argument(
+        "--currencies", nargs="+", default=[CURRENCY_CODE], metavar="CODE",
+        help=f"коды валют, по столбцу на каждую ('{ALL_CURRENCIES}' — все валюты архива)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Загружает курсы и сохраняет их в CSV-файл."""
+    args = parse_args()
+    days = build_date_range(DAYS_IN_YEAR)
+    currency_codes = None if ALL_CURRENCIES in args.currencies else [code.upper() for code in args.currencies]
+
+    cache = None if args.no_cache else ResponseCache(CACHE_DIR)
+    scheduler = FetchScheduler(REQUESTS_PER_SECOND, MAX_RETRIES, RETRY_BUDGET)
+
+    existing = read_existing(CSV_PATH) if args.incremental else None
+    if args.incremental:
+        # Повторяем дни, которые не удалось загрузить в прошлые запуски
+        failed_before = read_failed_days(FAILED_DAYS_PATH)
+        missing = set(select_missing_days(days, existing, currency_codes))
+        days = [day for day in days if day in missing or day in failed_before]
+        print(f"Дней для загрузки: {len(days)}")
+
+    # Загружаем данные за последние несколько дней (например, 365 дней) параллельно
+    currency_data = fetch_rates(
+        days,
+        max_workers=MAX_WORKERS,
+        base_url=BASE_URL,
+        currency_codes=currency_codes,
+        cache=cache,
+        scheduler=scheduler,
+    )
+    save_failed_days(scheduler.failed, FAILED_DAYS_PATH)
+    if scheduler.failed:
+        print(f"Не удалось загрузить дней: {len(scheduler.failed)} (см. {FAILED_DAYS_PATH})")
 
     # Сохраняем данные в CSV файл
-    save_to_csv(currency_data)
+    if args.incremental:
+        save_incremental(currency_data, existing, CSV_PATH, currency_codes)
+    else:
+        save_to_csv(currency_data, currency_codes=currency_codes)
     print(f"Данные успешно сохранены в {FILENAME}")
 
+
+# Основной код программы
+if __name__ == "__main__":
+    main()
+
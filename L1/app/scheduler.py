@@ -0,0 +1,181 @@
+import json
+import os
+import random
+import threading
+import time
+from datetime import date, datetime
+from http import HTTPStatus
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+import requests
+
+# Константы
+DEFAULT_RATE = 10.0  # Запросов в секунду
+DEFAULT_MAX_RETRIES = 5  # Повторов для одного дня
+DEFAULT_RETRY_BUDGET = 100  # Повторов на весь запуск
+BASE_DELAY = 0.5  # Начальная задержка перед повтором в секундах
+MAX_DELAY = 30.0  # Максимальная задержка перед повтором в секундах
+DATE_FORMAT = '%Y/%m/%d'
+
+# Коды ответа, после которых запрос имеет смысл повторить
+RETRY_STATUSES = {
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов «ведро с жетонами».
+
+    Жетоны пополняются со скоростью rate в секунду, но не более capacity.
+    Каждый запрос забирает один жетон; если жетонов нет, поток ждет.
+    Жетоны резервируются под замком, а ожидание идет вне его, поэтому
+    потоки обслуживаются по очереди без простоя.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Забирает жетон, при необходимости дожидаясь его появления."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+
+
+class FetchScheduler:
+    """
+    Планировщик запросов к архиву: ограничение частоты, повторы с
+    экспоненциальной задержкой и случайным разбросом, общий лимит повторов
+    на запуск и журнал дней, которые так и не удалось загрузить.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, max_retries: int = DEFAULT_MAX_RETRIES,
+                 retry_budget: int = DEFAULT_RETRY_BUDGET, base_delay: float = BASE_DELAY,
+                 max_delay: float = MAX_DELAY, sleep: Callable[[float], None] = time.sleep,
+                 rng: Callable[[], float] = random.random):
+        self.bucket = TokenBucket(rate, sleep=sleep)
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failed: Dict[Hashable, str] = {}
+        self._sleep = sleep
+        self._rng = rng
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Возвращает задержку перед повтором номер attempt (с нуля).
+
+        Используется «полный разброс»: случайное значение от 0 до
+        base_delay * 2 ** attempt, но не больше max_delay. Если сервер
+        прислал Retry-After, ждем не меньше указанного времени, но тоже
+        не больше max_delay: ошибочный заголовок не должен останавливать загрузку.
+        """
+        delay = self._rng() * min(self.max_delay, self.base_delay * 2 ** attempt)
+        if retry_after is not None:
+            delay = min(max(delay, retry_after), self.max_delay)
+        return delay
+
+    def throttle(self) -> None:
+        """Ожидает разрешения на очередной сетевой запрос."""
+        self.bucket.acquire()
+
+    def run(self, func: Callable[[], T], key: Hashable) -> T:
+        """
+        Выполняет запрос с повторами после временных ошибок.
+
+        Перед каждым обращением к сети func должна вызывать throttle():
+        ответы из кэша не расходуют жетоны.
+
+        :param func: Функция, выполняющая запрос.
+        :param key: Ключ запроса (дата) для журнала ошибок.
+        :raises Exception: последняя ошибка, если запрос не удался.
+        """
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except Exception as err:
+                if not is_retryable(err) or attempt >= self.max_retries or not self._take_retry():
+                    if not is_missing(err):
+                        with self._lock:
+                            self.failed[key] = str(err)
+                    raise
+                self._sleep(self.backoff(attempt, retry_after(err)))
+                attempt += 1
+
+    def _take_retry(self) -> bool:
+        with self._lock:
+            if self.retry_budget <= 0:
+                return False
+            self.retry_budget -= 1
+            return True
+
+
+def _status(err: Exception) -> Optional[int]:
+    response = getattr(err, "response", None)
+    return response.status_code if response is not None else None
+
+
+def is_retryable(err: Exception) -> bool:
+    """Проверяет, стоит ли повторять запрос после ошибки."""
+    if isinstance(err, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    return _status(err) in RETRY_STATUSES
+
+
+def is_missing(err: Exception) -> bool:
+    """Ответ 404 означает выходной или праздник, а не сбой загрузки."""
+    return _status(err) == HTTPStatus.NOT_FOUND
+
+
+def retry_after(err: Exception) -> Optional[float]:
+    """Возвращает значение заголовка Retry-After в секундах, если оно есть."""
+    response = getattr(err, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def read_failed_days(filename: str) -> Dict[date, str]:
+    """Читает журнал дней, которые не удалось загрузить."""
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, encoding="utf-8") as file:
+        data = json.load(file)
+    return {datetime.strptime(date_str, DATE_FORMAT).date(): error for date_str, error in data.items()}
+
+
+def save_failed_days(failed: Dict[date, str], filename: str) -> None:
+    """Сохраняет журнал дней, которые не удалось загрузить (атомарно)."""
+    data = {day.strftime(DATE_FORMAT): error for day, error in sorted(failed.items(), reverse=True)}
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_filename, filename)
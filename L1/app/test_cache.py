@@ -0,0 +1,90 @@
+import os
+import time
+from datetime import date
+
+import pytest
+from cache import ResponseCache
+from fetcher import build_date_range, build_url, fetch_rates
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Фикстура с пустым кэшем во временной директории."""
+    return ResponseCache(str(tmp_path / "cache"))
+
+
+def test_put_and_get(cache):
+    """Сохраненная запись читается обратно по тому же адресу."""
+    cache.put("http://host/a", 200, {"Valute": {}}, etag='"a"')
+    entry = cache.get("http://host/a")
+
+    assert entry["payload"] == {"Valute": {}}, "Тело ответа не сохранено."
+    assert cache.validators(entry) == {"If-None-Match": '"a"'}, "Неверные заголовки условного запроса."
+    assert cache.get("http://host/b") is None, "Запись для другого адреса не должна находиться."
+
+
+def test_put_leaves_no_temp_files(cache):
+    """После записи в директории кэша остаются только готовые файлы."""
+    cache.put("http://host/a", 200, {"x": 1})
+    files = [name for _, _, names in os.walk(cache.directory) for name in names]
+    assert len(files) == 1 and files[0].endswith(".json"), "Остались временные файлы."
+
+
+def test_corrupted_entry_is_ignored(cache):
+    """Поврежденная запись считается отсутствующей."""
+    cache.put("http://host/a", 200, {"x": 1})
+    with open(cache._path("http://host/a"), "w", encoding="utf-8") as file:
+        file.write("{broken")
+    assert cache.get("http://host/a") is None
+
+
+def test_is_fresh_for_past_and_recent_days(cache):
+    """Записи за прошлые дни неизменны, за сегодняшний день — требуют проверки."""
+    cache.put("http://host/a", 200, {})
+    entry = cache.get("http://host/a")
+
+    assert cache.is_fresh(entry, date(2020, 1, 1)), "Прошедший день должен браться из кэша."
+    assert not cache.is_fresh(entry, date.today()), "Сегодняшний день должен перепроверяться."
+
+    entry["stored_at"] = time.time() - 100
+    assert not ResponseCache(cache.directory, immutable_ttl=10).is_fresh(entry, date(2020, 1, 1)), \
+        "Устаревшая запись не должна считаться свежей."
+
+
+def test_not_found_for_today_is_not_final(cache):
+    """404, полученный в день публикации, не становится неизменным на следующий день."""
+    cache.put("http://host/a", 404)
+    entry = cache.get("http://host/a")
+    yesterday = date.fromordinal(date.today().toordinal() - 1)
+
+    entry["stored_at"] = time.time() - 24 * 3600  # Сохранена вчера, за вчерашний день
+    assert not cache.is_fresh(entry, yesterday), "Отсутствие курса за «сегодня» не должно кэшироваться навсегда."
+
+    entry["stored_at"] = time.time()  # Перепроверена после окончания дня
+    assert cache.is_fresh(entry, yesterday), "Запись, сохраненная после окончания дня, неизменна."
+
+
+def test_rerun_costs_no_requests(stub_server, cache):
+    """Повторная загрузка того же диапазона не обращается к серверу."""
+    days = build_date_range(6, end_date=date(2024, 10, 5))
+    first = fetch_rates(days, max_workers=4, base_url=stub_server.base_url, cache=cache)
+    requests_after_first_run = stub_server.requests
+
+    second = fetch_rates(days, max_workers=4, base_url=stub_server.base_url, cache=cache)
+
+    assert second == first, "Данные из кэша отличаются от загруженных."
+    assert requests_after_first_run == 6
+    assert stub_server.requests == 6, "Повторный запуск не должен обращаться к серверу."
+
+
+def test_stale_entry_is_revalidated(stub_server, tmp_path):
+    """Устаревшая запись перепроверяется условным запросом с ETag."""
+    cache = ResponseCache(str(tmp_path / "cache"), immutable_ttl=0)
+    day = date(2024, 10, 4)
+    fetch_rates([day], base_url=stub_server.base_url, cache=cache)
+    rates = fetch_rates([day], base_url=stub_server.base_url, cache=cache)
+
+    entry = cache.get(build_url(day, stub_server.base_url))
+    assert rates == {"2024/10/04": {"USD": 95.0262}}, "Курс после ответа 304 потерян."
+    assert stub_server.requests == 2, "Устаревшая запись должна перепроверяться."
+    assert entry["etag"] == '"2024/10/04"', "Запись должна остаться в кэше."
@@ -0,0 +1,47 @@
+from datetime import date
+
+from fetcher import build_date_range, build_url, extract_rates, fetch_rates
+
+
+def test_build_date_range():
+    """Проверка формирования списка дат от новой к старой."""
+    days = build_date_range(3, end_date=date(2024, 1, 2))
+    assert days == [date(2024, 1, 2), date(2024, 1, 1), date(2023, 12, 31)], "Неверный диапазон дат."
+
+
+def test_build_url():
+    """Проверка адреса архивного файла."""
+    assert build_url(date(2024, 1, 5), "http://host/archive/") == "http://host/archive/2024/01/05/daily_json.js"
+
+
+def test_extract_rates_single_pass():
+    """Из одного ответа извлекаются все запрошенные валюты."""
+    payload = {"Valute": {"USD": {"Value": 95.0}, "EUR": {"Value": 105.0}, "CNY": {"Value": 13.0}}}
+
+    assert extract_rates(payload, ["EUR", "USD", "XXX"]) == {"EUR": 105.0, "USD": 95.0}, "Неверный набор валют."
+    assert extract_rates(payload, None) == {"USD": 95.0, "EUR": 105.0, "CNY": 13.0}, "Должны извлекаться все валюты."
+    assert extract_rates({}, ["USD"]) == {}, "Для пустого ответа курсов быть не должно."
+
+
+def test_fetch_rates_keeps_date_order(stub_server):
+    """Результаты собираются параллельно, но возвращаются в порядке входных дат."""
+    days = build_date_range(6, end_date=date(2024, 10, 5))
+    rates = fetch_rates(days, max_workers=6, base_url=stub_server.base_url)
+
+    assert list(rates) == ["2024/10/04", "2024/10/03", "2024/10/02", "2024/10/01"], "Нарушен порядок дат."
+    assert rates["2024/10/03"] == {"USD": 94.5054}, "Неверный курс."
+    assert stub_server.requests == 6, "Каждый день должен запрашиваться один раз."
+
+
+def test_fetch_rates_respects_concurrency_limit(stub_server):
+    """Число одновременных запросов не превышает max_workers."""
+    days = build_date_range(12, end_date=date(2024, 10, 5))
+    fetch_rates(days, max_workers=3, base_url=stub_server.base_url)
+
+    assert 1 < stub_server.max_in_flight <= 3, "Лимит параллельных запросов не соблюдается."
+
+
+def test_fetch_rates_server_unavailable():
+    """Недоступный сервер не приводит к исключению, а дает пустой результат."""
+    rates = fetch_rates([date(2024, 10, 4)], max_workers=2, base_url="http://127.0.0.1:9/archive/")
+    assert rates == {}, "При ошибке соединения данных быть не должно."
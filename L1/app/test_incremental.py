@@ -0,0 +1,80 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+from incremental import merge_rates, read_existing, save_incremental, select_missing_days
+
+CSV_CONTENT = "Дата;Курс USD\n2024/10/04;95.0262\n2024/10/03;94.5054\n2024/10/01;92.9000\n"
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Фикстура с уже сохраненным набором данных."""
+    file_path = tmp_path / "dataset_v3.csv"
+    file_path.write_text(CSV_CONTENT, encoding="utf-8-sig")
+    return file_path
+
+
+def test_read_existing_missing_file(tmp_path):
+    """При отсутствии файла возвращается None."""
+    assert read_existing(str(tmp_path / "absent.csv")) is None
+
+
+def test_select_missing_days_only_outside_coverage(csv_file):
+    """Загружаются только даты новее или старше сохраненного диапазона."""
+    existing = read_existing(str(csv_file))
+    days = [date(2024, 10, day) for day in range(6, 0, -1)] + [date(2024, 9, 30)]
+
+    missing = select_missing_days(days, existing)
+
+    assert missing == [date(2024, 10, 6), date(2024, 10, 5), date(2024, 9, 30)], "Неверно определены недостающие даты."
+
+
+def test_select_missing_days_without_file():
+    """Без сохраненного файла загружаются все даты."""
+    days = [date(2024, 10, 2), date(2024, 10, 1)]
+    assert select_missing_days(days, None) == days
+
+
+def test_merge_rates_keeps_order_and_replaces_duplicates(csv_file):
+    """Новые строки встают по дате, дубликаты заменяются новыми значениями."""
+    existing = read_existing(str(csv_file))
+    merged = merge_rates(existing, {"2024/10/05": {"USD": 94.87}, "2024/10/04": {"USD": 95.1}}, ["USD"])
+
+    assert list(merged["Дата"]) == ["2024/10/05", "2024/10/04", "2024/10/03", "2024/10/01"], "Нарушен порядок дат."
+    assert merged.loc[1, "Курс USD"] == "95.1", "Значение за дату не обновлено."
+
+
+def test_save_incremental_does_not_rewrite_untouched_rows(csv_file):
+    """Сохраненные строки переносятся в файл без изменений."""
+    existing = read_existing(str(csv_file))
+    save_incremental({"2024/10/05": {"USD": 94.87}}, existing, str(csv_file), ["USD"])
+
+    lines = csv_file.read_text(encoding="utf-8-sig").splitlines()
+    assert lines[1] == "2024/10/05;94.87", "Новая строка не добавлена."
+    assert lines[2:] == CSV_CONTENT.splitlines()[1:], "Старые строки изменились."
+    assert len(pd.read_csv(csv_file, sep=";", encoding="utf-8-sig")) == 4
+
+
+def test_select_missing_days_for_new_currency(csv_file):
+    """Если в файле нет столбца запрошенной валюты, загружаются все даты."""
+    existing = read_existing(str(csv_file))
+    days = [date(2024, 10, 4), date(2024, 10, 3)]
+    assert select_missing_days(days, existing, ["USD", "EUR"]) == days
+
+
+def test_merge_rates_adds_currency_columns(csv_file):
+    """Столбцы новых валют добавляются справа, пропуски остаются пустыми."""
+    existing = read_existing(str(csv_file))
+    merged = merge_rates(existing, {"2024/10/05": {"USD": 94.87, "EUR": 104.1}}, ["USD", "EUR"])
+
+    assert list(merged.columns) == ["Дата", "Курс USD", "Курс EUR"], "Неверный порядок столбцов."
+    assert merged.loc[0, "Курс EUR"] == "104.1"
+    assert merged.loc[1, "Курс EUR"] == "", "Пропуск должен оставаться пустым."
+
+
+def test_save_incremental_without_new_data(csv_file):
+    """Если новых данных нет, файл не перезаписывается."""
+    mtime = csv_file.stat().st_mtime_ns
+    save_incremental({}, read_existing(str(csv_file)), str(csv_file))
+    assert csv_file.stat().st_mtime_ns == mtime, "Файл не должен изменяться."
@@ -0,0 +1,23 @@
+import pandas as pd
+from main import save_to_csv
+
+
+def test_save_to_csv_single_currency(tmp_path):
+    """Для одной валюты формат файла не меняется: 'Дата;Курс USD'."""
+    file_path = tmp_path / "dataset_v3.csv"
+    save_to_csv({"2024/10/05": {"USD": 94.87}, "2024/10/04": {"USD": 95.0262}}, str(file_path), ["USD"])
+
+    assert file_path.read_text(encoding="utf-8-sig").splitlines() == [
+        "Дата;Курс USD", "2024/10/05;94.87", "2024/10/04;95.0262",
+    ], "Формат файла изменился."
+
+
+def test_save_to_csv_all_currencies(tmp_path):
+    """Для всех валют создается широкая таблица с отдельным столбцом на каждую."""
+    file_path = tmp_path / "dataset_v3.csv"
+    data = {"2024/10/05": {"USD": 94.87, "EUR": 104.1}, "2024/10/04": {"USD": 95.0262}}
+    save_to_csv(data, str(file_path), None)
+
+    df = pd.read_csv(file_path, sep=";", encoding="utf-8-sig")
+    assert list(df.columns) == ["Дата", "Курс EUR", "Курс USD"], "Неверный набор столбцов."
+    assert df["Курс EUR"].isnull().sum() == 1, "Отсутствующий курс должен быть пустым."
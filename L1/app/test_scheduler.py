@@ -0,0 +1,126 @@
+from datetime import date
+
+import pytest
+import requests
+from fetcher import build_date_range, fetch_rates
+from scheduler import FetchScheduler, TokenBucket, read_failed_days, save_failed_days
+
+
+class FakeClock:
+    """Часы, которые двигаются только при вызове sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status} Error", response=response)
+
+
+def raising(err):
+    def request():
+        raise err
+    return request
+
+
+def test_token_bucket_limits_rate():
+    """После исчерпания запаса запросы идут не чаще rate в секунду."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=5, capacity=2, clock=clock, sleep=clock.sleep)
+    for _ in range(12):
+        bucket.acquire()
+    assert clock.now == pytest.approx(2.0), "12 запросов при rate=5 и запасе 2 должны занять 2 секунды."
+
+
+def test_backoff_grows_exponentially_and_is_capped():
+    """Задержка растет вдвое с каждой попыткой, но не выше max_delay."""
+    scheduler = FetchScheduler(base_delay=1, max_delay=5, rng=lambda: 1.0)
+    assert [scheduler.backoff(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+    assert scheduler.backoff(0, retry_after=3) == 3, "Retry-After должен соблюдаться."
+    assert scheduler.backoff(0, retry_after=86400) == 5, "Retry-After должен ограничиваться max_delay."
+
+
+def test_run_retries_transient_errors():
+    """Временные ошибки повторяются, пока запрос не пройдет."""
+    clock = FakeClock()
+    scheduler = FetchScheduler(rate=100, max_retries=3, sleep=clock.sleep, rng=lambda: 0.5)
+    errors = [http_error(503), http_error(429)]
+
+    def request():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert scheduler.run(request, "day") == "ok"
+    assert len(clock.sleeps) == 2, "Должно быть два повтора."
+    assert scheduler.failed == {}
+
+
+def test_run_records_permanent_failure():
+    """После исчерпания повторов день попадает в журнал, 404 — нет."""
+    scheduler = FetchScheduler(rate=100, max_retries=2, sleep=lambda _: None)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        scheduler.run(raising(http_error(500)), "bad")
+    with pytest.raises(requests.exceptions.HTTPError):
+        scheduler.run(raising(http_error(404)), "weekend")
+
+    assert list(scheduler.failed) == ["bad"], "В журнале должны быть только сбойные дни."
+    assert scheduler.retry_budget == 98, "Повторы должны списываться с общего лимита."
+
+
+def test_retry_budget_is_shared():
+    """Когда общий лимит повторов исчерпан, ошибки больше не повторяются."""
+    scheduler = FetchScheduler(rate=100, max_retries=5, retry_budget=1, sleep=lambda _: None)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise http_error(503)
+
+    for key in ("a", "b"):
+        with pytest.raises(requests.exceptions.HTTPError):
+            scheduler.run(failing, key)
+    assert len(calls) == 3, "Лимит в один повтор должен действовать на весь запуск."
+
+
+def test_failed_days_manifest_roundtrip(tmp_path):
+    """Журнал незагруженных дней сохраняется и читается обратно."""
+    path = str(tmp_path / "failed_days.json")
+    save_failed_days({date(2024, 10, 1): "503", date(2024, 10, 3): "timeout"}, path)
+    assert read_failed_days(path) == {date(2024, 10, 1): "503", date(2024, 10, 3): "timeout"}
+    assert read_failed_days(str(tmp_path / "absent.json")) == {}
+
+
+def test_fetch_rates_survives_injected_failures(stub_server):
+    """Сбои сервера 429/5xx не оставляют дыр в данных."""
+    stub_server.failures = {"2024/10/03": [503, 429], "2024/10/02": [500]}
+    scheduler = FetchScheduler(rate=50, base_delay=0.01)
+    days = build_date_range(5, end_date=date(2024, 10, 5))
+
+    rates = fetch_rates(days, max_workers=4, base_url=stub_server.base_url, scheduler=scheduler)
+
+    assert list(rates) == ["2024/10/04", "2024/10/03", "2024/10/02", "2024/10/01"], "Дни потеряны после сбоев."
+    assert scheduler.failed == {}
+
+
+def test_fetch_rates_reports_exhausted_days(stub_server):
+    """День, который не удалось загрузить, попадает в журнал."""
+    stub_server.failures = {"2024/10/03": [503] * 10}
+    scheduler = FetchScheduler(rate=50, max_retries=2, base_delay=0.01)
+    days = build_date_range(3, end_date=date(2024, 10, 4))
+
+    rates = fetch_rates(days, max_workers=2, base_url=stub_server.base_url, scheduler=scheduler)
+
+    assert list(rates) == ["2024/10/04", "2024/10/02"]
+    assert list(scheduler.failed) == [date(2024, 10, 3)], "Сбойный день должен попасть в журнал."
@@ -1,10 +1,9 @@
 from split_columns import split_csv_by_columns
-from split_by_year import split_dataset_by_years
-from split_by_week import split_dataset_by_weeks
+from partition import split_dataset_by_periods
 from get_data_by_date import get_data_by_date
 from datetime import datetime
 from http import HTTPStatus
-from manage_data import load_currency_data
+from rate_store import open_rate_store
 
 # Константы
 FILENAME = "dataset_v3.csv"
@@ -28,17 +27,18 @@ def main() -> None:
     split_csv_by_columns(CSV_PATH)
     print("Файлы X.csv и Y.csv успешно созданы в директории Lab_2_tmpFiles.")
 
-    # 2. Разбиваем файл на несколько файлов по годам
-    split_dataset_by_years(CSV_PATH)
+    # 2-3. Разбиваем файл на несколько файлов по годам и по неделям за одно чтение
+    # Перезаписываются только периоды, содержимое которых изменилось с прошлого запуска
+    timings = split_dataset_by_periods(
+        CSV_PATH, {'year': 'Lab_2_tmpFiles/Year', 'week': 'Lab_2_tmpFiles/Week'}, incremental=True
+    )
     print("Данные успешно разбиты по годам и сохранены в директории Lab_2_tmpFiles/Year.")
-
-    # 3. Разбиваем файл на несколько файлов по неделям
-    split_dataset_by_weeks(CSV_PATH)
     print("Данные успешно разбиты по неделям и сохранены в директории Lab_2_tmpFiles/Week.")
+    print(f"Обновлено файлов: {len(timings)}.")
 
  
-    # Пример использования функции для конкретной даты
-    currency_data = load_currency_data(CSV_PATH)
+    # Пример использования функции для конкретной даты: курсы читаются из отображаемого в память хранилища
+    currency_data = open_rate_store(CSV_PATH)
     example_date = datetime(2024, 1, 11)
     result = get_data_by_date(currency_data, example_date)
     print(f"Данные для {example_date}: {result}")
@@ -1,6 +1,8 @@
 import os
 import pandas as pd
 
+from storage import load_dataset
+
 CSV_SEP = ';'
 CSV_ENCODING = 'utf-8-sig'
 
@@ -12,14 +14,17 @@ def load_currency_data(filename: str) -> dict:
     """
     Загрузка данных о валюте из CSV-файла и преобразование их в словарь.
 
+    Данные читаются через load_dataset, поэтому при наличии актуальной
+    Parquet-копии CSV повторно не разбирается.
+
     :param filename: Имя CSV-файла.
     :return: Словарь с датами и курсами валют.
     """
-    df = load_csv(filename)
-    df['Дата'] = pd.to_datetime(df['Дата']).dt.strftime('%Y-%m-%d')
+    df = load_dataset(filename)
+    df['Дата'] = df['Дата'].dt.strftime('%Y-%m-%d')
     return dict(zip(df['Дата'], df['Курс USD']))
 
 def create_directory(directory_name: str) -> None:
     """Создает директорию, если она не существует."""
     if not os.path.exists(directory_name):
-        os.makedirs(directory_name)
\ No newline at end of file
+        os.makedirs(directory_name)
\ No newline at end of file
@@ -0,0 +1,116 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+from typing import Optional, Tuple, Union
+
+from storage import load_dataset
+
+# Константы
+DATE_COLUMN = 'Дата'
+RATE_COLUMN = 'Курс USD'
+MAX_LOOKBACK_DAYS = 10  # Самые длинные праздники (новогодние) короче этого срока
+
+DateLike = Union[date, datetime, np.datetime64, str]
+
+
+def to_day(value: DateLike) -> np.datetime64:
+    """Приводит дату к np.datetime64 с точностью до дня."""
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+class RateIndex:
+    """
+    Индекс курсов валюты по дате для многократных запросов.
+
+    Файл читается один раз (через load_dataset) в два отсортированных
+    массива: даты datetime64[D] и курсы float64. Запросы выполняются
+    двоичным поиском (np.searchsorted) без перебора и без построения
+    словаря. Перед каждым запросом сверяются время изменения и размер
+    файла, и при их изменении индекс перечитывается.
+    """
+
+    def __init__(self, filename: str, column: str = RATE_COLUMN,
+                 max_lookback_days: int = MAX_LOOKBACK_DAYS):
+        self.filename = filename
+        self.column = column
+        self.max_lookback_days = max_lookback_days
+        self._signature = None
+        self._dates = np.empty(0, dtype='datetime64[D]')
+        self._rates = np.empty(0, dtype=np.float64)
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        df = load_dataset(self.filename)
+        df = df[[DATE_COLUMN, self.column]].dropna()
+        df = df.sort_values(DATE_COLUMN, kind='stable').drop_duplicates(DATE_COLUMN, keep='last')
+        self._dates = df[DATE_COLUMN].to_numpy(dtype='datetime64[D]')
+        self._rates = pd.to_numeric(df[self.column], errors='coerce').to_numpy(dtype=np.float64)
+
+    def _arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Возвращает массивы дат и курсов, при необходимости перечитав файл."""
+        with self._lock:
+            stat = os.stat(self.filename)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature != self._signature:
+                self._load()
+                self._signature = signature
+            return self._dates, self._rates
+
+    def __len__(self) -> int:
+        return len(self._arrays()[0])
+
+    def to_series(self) -> pd.Series:
+        """Возвращает все курсы в виде Series, индекс — отсортированные даты."""
+        dates, rates = self._arrays()
+        return pd.Series(rates, index=pd.DatetimeIndex(dates, name=DATE_COLUMN), name=self.column)
+
+    def exact(self, target_date: DateLike) -> Optional[float]:
+        """
+        Возвращает курс ровно на указанную дату.
+
+        :param target_date: Дата запроса.
+        :return: Курс или None, если на эту дату курса нет.
+        """
+        dates, rates = self._arrays()
+        day = to_day(target_date)
+        position = np.searchsorted(dates, day)
+        if position < len(dates) and dates[position] == day:
+            return float(rates[position])
+        return None
+
+    def previous(self, target_date: DateLike,
+                 max_lookback_days: Optional[int] = None) -> Optional[Tuple[date, float]]:
+        """
+        Возвращает последний известный курс на указанную дату или раньше.
+
+        Для выходных и праздников это курс ближайшего предыдущего рабочего дня.
+
+        :param target_date: Дата запроса.
+        :param max_lookback_days: Насколько дней назад можно искать курс
+            (None — значение, заданное при создании индекса).
+        :return: Пара (дата курса, курс) или None, если курса нет.
+        """
+        if max_lookback_days is None:
+            max_lookback_days = self.max_lookback_days
+        dates, rates = self._arrays()
+        day = to_day(target_date)
+        position = np.searchsorted(dates, day, side='right') - 1
+        if position < 0 or day - dates[position] > np.timedelta64(max_lookback_days, 'D'):
+            return None
+        return dates[position].item(), float(rates[position])
+
+    def range(self, start_date: DateLike, end_date: DateLike) -> pd.Series:
+        """
+        Возвращает курсы за период включительно.
+
+        :param start_date: Начальная дата периода.
+        :param end_date: Конечная дата периода.
+        :return: Series с курсами, индекс — даты.
+        """
+        dates, rates = self._arrays()
+        start = np.searchsorted(dates, to_day(start_date), side='left')
+        end = np.searchsorted(dates, to_day(end_date), side='right')
+        return pd.Series(rates[start:end], index=pd.DatetimeIndex(dates[start:end], name=DATE_COLUMN),
+                         name=self.column)
@@ -0,0 +1,314 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from rate_index import DATE_COLUMN, MAX_LOOKBACK_DAYS, DateLike, to_day
+from storage import load_dataset
+
+# Константы
+RATE_PREFIX = 'Курс '
+DEFAULT_CURRENCY = 'USD'
+STORE_SUFFIX = '.rates'
+META_FILENAME = 'meta.json'
+POINTER_FILENAME = 'CURRENT'  # Имя поддиректории текущего поколения
+DATES_FILENAME = 'dates.i4'
+DATE_DTYPE = np.dtype('<i4')  # Номер дня от 1970-01-01
+RATE_DTYPE = np.dtype('<f8')
+
+
+def store_path(csv_path: str) -> str:
+    """Возвращает путь к хранилищу курсов для CSV-файла (dataset_v3.csv -> dataset_v3.rates)."""
+    return os.path.splitext(csv_path)[0] + STORE_SUFFIX
+
+
+def currency_codes(df: pd.DataFrame) -> List[str]:
+    """Возвращает коды валют по столбцам 'Курс <код>'."""
+    return [column[len(RATE_PREFIX):] for column in df.columns if column.startswith(RATE_PREFIX)]
+
+
+def _rate_filename(currency: str) -> str:
+    return f"{currency}.f8"
+
+
+def _write_meta(directory: str, meta: dict) -> None:
+    path = os.path.join(directory, META_FILENAME)
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as file:
+        json.dump(meta, file, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+
+
+def _write_pointer(directory: str, name: str) -> None:
+    path = os.path.join(directory, POINTER_FILENAME)
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as file:
+        file.write(name)
+    os.replace(f"{path}.tmp", path)
+
+
+def _read_pointer(directory: str) -> Optional[str]:
+    try:
+        with open(os.path.join(directory, POINTER_FILENAME), encoding='utf-8') as file:
+            return file.read().strip() or None
+    except OSError:
+        return None
+
+
+def _read_meta(directory: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(directory, META_FILENAME), encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _current_meta(directory: str) -> Tuple[Optional[str], Optional[dict]]:
+    """Возвращает путь к текущему поколению хранилища и его meta.json."""
+    name = _read_pointer(directory)
+    if name is None:
+        return None, None
+    path = os.path.join(directory, name)
+    return path, _read_meta(path)
+
+
+def _rows(df: pd.DataFrame, currencies: Sequence[str]) -> Tuple[np.ndarray, Dict[str, Tuple[np.ndarray, np.dtype]]]:
+    """
+    Готовит строки к записи: номера дней и значения по файлам столбцов.
+
+    :raises ValueError: если даты повторяются.
+    """
+    df = df.dropna(subset=[DATE_COLUMN]).sort_values(DATE_COLUMN, kind='stable')
+    ordinals = df[DATE_COLUMN].to_numpy(dtype='datetime64[D]').astype(DATE_DTYPE)
+    if np.any(np.diff(ordinals) <= 0):
+        raise ValueError("Даты должны быть уникальными и новее последней сохраненной даты.")
+
+    columns = {DATES_FILENAME: (ordinals, DATE_DTYPE)}
+    for code in currencies:
+        column = RATE_PREFIX + code
+        values = pd.to_numeric(df[column], errors='coerce') if column in df else np.nan
+        columns[_rate_filename(code)] = (np.broadcast_to(np.asarray(values, dtype=RATE_DTYPE), len(df)), RATE_DTYPE)
+    return ordinals, columns
+
+
+def _append_columns(directory: str, columns: Dict[str, Tuple[np.ndarray, np.dtype]], count: int) -> None:
+    """Дописывает значения в файлы столбцов, в которых сохранено count строк."""
+    for filename, (values, dtype) in columns.items():
+        with open(os.path.join(directory, filename), 'r+b') as file:
+            # Отбрасываем хвост незавершенной записи, если она была
+            file.truncate(count * dtype.itemsize)
+            file.seek(0, os.SEEK_END)
+            file.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+
+def _publish(directory: str, currencies: Sequence[str], source: Optional[dict],
+             columns: Dict[str, Tuple[np.ndarray, np.dtype]], base: Optional[str] = None, count: int = 0) -> None:
+    """
+    Записывает новое поколение хранилища и делает его текущим.
+
+    Поколение целиком собирается в новой поддиректории, и только затем
+    файл CURRENT атомарно переключается на нее: читатели видят либо
+    прежние данные, либо новые, а уже отображенные в память файлы не
+    изменяются. Предыдущее поколение сохраняется для читателей, успевших
+    прочитать старый CURRENT, более старые удаляются.
+
+    :param columns: Новые строки по файлам столбцов (см. _rows).
+    :param base: Поколение, первые count строк которого копируются перед новыми.
+    """
+    os.makedirs(directory, exist_ok=True)
+    previous_path, previous_meta = _current_meta(directory)
+    generation = (previous_meta or {}).get('generation', 0) + 1
+    path = tempfile.mkdtemp(prefix=f"{generation:06d}.", dir=directory)
+    for filename in [DATES_FILENAME] + [_rate_filename(code) for code in currencies]:
+        if base is None:
+            open(os.path.join(path, filename), 'wb').close()
+        else:
+            shutil.copyfile(os.path.join(base, filename), os.path.join(path, filename))
+    _append_columns(path, columns, count)
+    added = len(columns[DATES_FILENAME][0]) if columns else 0
+    _write_meta(path, {'currencies': list(currencies), 'count': count + added, 'source': source,
+                       'generation': generation})
+    _write_pointer(directory, os.path.basename(path))
+    _remove_stale(directory, [os.path.basename(path), previous_path and os.path.basename(previous_path)])
+
+
+def _remove_stale(directory: str, keep: Sequence[Optional[str]]) -> None:
+    """Удаляет из директории хранилища все, кроме указанных имен."""
+    for name in os.listdir(directory):
+        if name in keep or name.startswith(POINTER_FILENAME):
+            continue
+        path = os.path.join(directory, name)
+        if os.path.isdir(path):
+            # Файлы, еще отображенные в память другим процессом, могут не удалиться (Windows)
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class RateStore:
+    """
+    Двоичное хранилище истории курсов на основе numpy.memmap.
+
+    Данные хранятся поколениями: каждое пересоздание хранилища пишет
+    новую поддиректорию, а файл CURRENT с ее именем подменяется через
+    os.replace. В поддиректории лежат столбцы фиксированной ширины:
+    номера дней (int32) в файле dates.i4 и по одному файлу float64 на
+    валюту (USD.f8, ...), а также meta.json со списком валют, числом
+    строк, номером поколения и сведениями об исходном файле. Строка
+    занимает 4 байта плюс 8 байт на валюту. Файлы отображаются в память
+    только для чтения, поэтому запрос читает лишь затронутые страницы,
+    а несколько процессов используют одну копию в кэше ОС.
+
+    Дописывание строк тоже создает новое поколение, поэтому отображенные
+    в память файлы никогда не изменяются. Открытое хранилище
+    переотображает столбцы, если сменилось поколение.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.currencies: List[str] = []
+        self._path = None
+        self._version = None  # (поколение, число строк) отображенных столбцов
+        self._dates = np.empty(0, dtype=DATE_DTYPE)
+        self._rates: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, directory: str, currencies: Sequence[str], source: Optional[dict] = None,
+               df: Optional[pd.DataFrame] = None) -> 'RateStore':
+        """
+        Создает новое поколение хранилища и делает его текущим (см. _publish).
+
+        :param directory: Путь к директории хранилища.
+        :param currencies: Коды валют.
+        :param source: Сведения об исходном файле для проверки актуальности.
+        :param df: Начальные строки (как в append).
+        """
+        _publish(directory, currencies, source, _rows(df, currencies)[1] if df is not None else {})
+        return cls(directory)
+
+    @staticmethod
+    def _map(path: str, filename: str, dtype: np.dtype, count: int) -> np.ndarray:
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(path, filename), dtype=dtype, mode='r', shape=(count,))
+
+    def _columns(self) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Возвращает отображенные столбцы, переоткрывая их после дописывания строк или пересоздания."""
+        with self._lock:
+            path, meta = _current_meta(self.directory)
+            if meta is None:
+                raise FileNotFoundError(f"Хранилище курсов {self.directory} не найдено.")
+            version = (meta['generation'], meta['count'])
+            if version != self._version:
+                count = meta['count']
+                self.currencies = meta['currencies']
+                self._dates = self._map(path, DATES_FILENAME, DATE_DTYPE, count)
+                self._rates = {code: self._map(path, _rate_filename(code), RATE_DTYPE, count)
+                               for code in self.currencies}
+                self._path, self._version = path, version
+            return self._dates, self._rates
+
+    def __len__(self) -> int:
+        return len(self._columns()[0])
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Дописывает строки в конец хранилища.
+
+        Файлы текущего поколения, которые могут быть отображены в память
+        читателями, не изменяются: строки записываются в копию, которая
+        публикуется как новое поколение (см. _publish).
+
+        :param df: DataFrame со столбцом 'Дата' (datetime64) и столбцами 'Курс <код>'.
+            Отсутствующие валюты записываются как NaN.
+        :return: Количество дописанных строк.
+        :raises ValueError: если даты не новее последней сохраненной или валюта неизвестна.
+        """
+        dates, _ = self._columns()
+        unknown = set(currency_codes(df)) - set(self.currencies)
+        if unknown:
+            raise ValueError(f"Валюты {', '.join(sorted(unknown))} отсутствуют в хранилище.")
+
+        ordinals, columns = _rows(df, self.currencies)
+        if len(ordinals) == 0:
+            return 0
+        if len(dates) and ordinals[0] <= dates[-1]:
+            raise ValueError("Даты должны быть уникальными и новее последней сохраненной даты.")
+
+        _publish(self.directory, self.currencies, _read_meta(self._path).get('source'), columns,
+                 base=self._path, count=len(dates))
+        return len(ordinals)
+
+    def to_series(self, currency: str = DEFAULT_CURRENCY) -> pd.Series:
+        """Возвращает все курсы валюты в виде Series, индекс — даты (дни без курса пропускаются)."""
+        dates, rates = self._columns()
+        index = pd.DatetimeIndex(dates.astype('datetime64[D]'), name=DATE_COLUMN)
+        return pd.Series(np.asarray(rates[currency]), index=index, name=RATE_PREFIX + currency).dropna()
+
+    def previous(self, target_date: DateLike, max_lookback_days: int = MAX_LOOKBACK_DAYS,
+                 currency: str = DEFAULT_CURRENCY) -> Optional[Tuple[date, float]]:
+        """
+        Возвращает последний известный курс на указанную дату или раньше.
+
+        :param target_date: Дата запроса.
+        :param max_lookback_days: Насколько дней назад можно искать курс.
+        :param currency: Код валюты.
+        :return: Пара (дата курса, курс) или None, если курса нет.
+        """
+        dates, rates = self._columns()
+        day = to_day(target_date).astype(DATE_DTYPE)
+        # Последний непустой курс валюты в окне поиска (дни без курса пропускаются, как в RateIndex)
+        start = np.searchsorted(dates, day - max_lookback_days, side='left')
+        end = np.searchsorted(dates, day, side='right')
+        valid = np.flatnonzero(~np.isnan(rates[currency][start:end]))
+        if valid.size == 0:
+            return None
+        position = start + valid[-1]
+        return np.datetime64(int(dates[position]), 'D').item(), float(rates[currency][position])
+
+    def range(self, start_date: DateLike, end_date: DateLike, currency: str = DEFAULT_CURRENCY) -> pd.Series:
+        """
+        Возвращает курсы валюты за период включительно.
+
+        :param start_date: Начальная дата периода.
+        :param end_date: Конечная дата периода.
+        :param currency: Код валюты.
+        :return: Series с курсами, индекс — даты (дни без курса пропускаются).
+        """
+        dates, rates = self._columns()
+        start = np.searchsorted(dates, to_day(start_date).astype(DATE_DTYPE), side='left')
+        end = np.searchsorted(dates, to_day(end_date).astype(DATE_DTYPE), side='right')
+        index = pd.DatetimeIndex(dates[start:end].astype('datetime64[D]'), name=DATE_COLUMN)
+        return pd.Series(np.array(rates[currency][start:end]), index=index, name=RATE_PREFIX + currency).dropna()
+
+
+def open_rate_store(csv_path: str) -> RateStore:
+    """
+    Открывает хранилище курсов рядом с CSV-файлом, при необходимости создавая его.
+
+    Хранилище пересобирается, если время изменения или размер CSV
+    отличаются от записанных при его создании. Пересборка создает новое
+    поколение (см. RateStore.create), поэтому уже открытые хранилища
+    при следующем запросе читают новые данные, даже если число строк
+    не изменилось.
+
+    :param csv_path: Путь к CSV-файлу.
+    :return: Открытое хранилище.
+    """
+    directory = store_path(csv_path)
+    stat = os.stat(csv_path)
+    source = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    _, meta = _current_meta(directory)
+    if meta is not None and meta.get('source') == source:
+        return RateStore(directory)
+
+    df = load_dataset(csv_path)
+    df = df.drop_duplicates(DATE_COLUMN, keep='last')
+    return RateStore.create(directory, currency_codes(df), source, df)
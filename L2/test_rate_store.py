@@ -0,0 +1,105 @@
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+from rate_index import RateIndex
+from rate_store import POINTER_FILENAME, RateStore, open_rate_store, store_path
+
+CSV_HEADER = "Дата;Курс USD;Курс EUR\n"
+
+
+def write_csv(path, rows, mtime_ns):
+    """Записывает CSV с курсами и задает ему время изменения."""
+    with open(path, "w", encoding="utf-8-sig") as file:
+        file.write(CSV_HEADER + "".join(f"{day};{usd};{eur}\n" for day, usd, eur in rows))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """CSV-файл с тремя днями курсов (4 января пропущено)."""
+    path = str(tmp_path / "dataset.csv")
+    write_csv(path, [("2024-01-02", 90.0, 98.0), ("2024-01-03", 91.0, 99.0), ("2024-01-05", 96.0, 100.0)],
+              1_700_000_000_000_000_000)
+    return path
+
+
+def test_lookups(csv_path):
+    """Курс на дату, на пропущенный день и за период читается из хранилища."""
+    store = open_rate_store(csv_path)
+
+    assert len(store) == 3
+    assert store.previous("2024-01-03") == (date(2024, 1, 3), 91.0)
+    assert store.previous("2024-01-04") == (date(2024, 1, 3), 91.0), "Пропущенный день берется из предыдущего."
+    assert store.previous("2024-01-01") is None, "До первой даты курса нет."
+    assert store.previous("2024-01-05", currency="EUR") == (date(2024, 1, 5), 100.0)
+    assert store.range("2024-01-03", "2024-01-05").tolist() == [91.0, 96.0]
+
+
+def test_append(csv_path):
+    """Дописанные строки видны уже открытому хранилищу, более ранние даты отклоняются."""
+    store = open_rate_store(csv_path)
+    reader = RateStore(store.directory)
+    assert len(reader) == 3
+
+    store.append(pd.DataFrame({"Дата": pd.to_datetime(["2024-01-06"]), "Курс USD": [97.5]}))
+    assert reader.previous("2024-01-06") == (date(2024, 1, 6), 97.5)
+    assert reader.previous("2024-01-06", currency="EUR") == (date(2024, 1, 5), 100.0), \
+        "День без курса валюты должен пропускаться, как в RateIndex."
+    assert reader.range("2024-01-05", "2024-01-06", currency="EUR").tolist() == [100.0]
+
+    with pytest.raises(ValueError):
+        store.append(pd.DataFrame({"Дата": pd.to_datetime(["2024-01-06"]), "Курс USD": [1.0]}))
+
+
+def test_rebuild_when_csv_changes(csv_path):
+    """Хранилище пересобирается при изменении CSV и не пересобирается без него."""
+    store = open_rate_store(csv_path)
+    first = open(os.path.join(store.directory, POINTER_FILENAME), encoding="utf-8").read()
+    open_rate_store(csv_path)
+    assert open(os.path.join(store.directory, POINTER_FILENAME), encoding="utf-8").read() == first, \
+        "Неизмененный CSV не должен пересобирать хранилище."
+
+    write_csv(csv_path, [("2024-01-02", 90.0, 98.0), ("2024-01-05", 96.0, 100.0)], 1_700_000_001_000_000_000)
+    rebuilt = open_rate_store(csv_path)
+    assert len(rebuilt) == 2
+    assert rebuilt.previous("2024-01-04") == (date(2024, 1, 2), 90.0)
+    assert len(os.listdir(store_path(csv_path))) <= 3, "Старые поколения должны удаляться."
+
+
+def test_open_handle_sees_rebuild_with_same_row_count(csv_path):
+    """Открытое хранилище читает новые значения после пересборки с тем же числом строк."""
+    stale = open_rate_store(csv_path)
+    assert stale.previous("2024-01-05") == (date(2024, 1, 5), 96.0)
+
+    write_csv(csv_path, [("2024-01-02", 90.0, 98.0), ("2024-01-03", 91.0, 99.0), ("2024-01-05", 97.0, 100.0)],
+              1_700_000_002_000_000_000)
+    fresh = open_rate_store(csv_path)
+
+    assert fresh.previous("2024-01-05") == (date(2024, 1, 5), 97.0)
+    assert stale.previous("2024-01-05") == (date(2024, 1, 5), 97.0), "Открытое хранилище вернуло устаревший курс."
+
+
+def test_append_keeps_mapped_files(csv_path):
+    """Дописывание создает новое поколение и не меняет файлы, отображенные в память."""
+    store = open_rate_store(csv_path)
+    old_series = store.to_series()
+    old_path = store._path
+
+    store.append(pd.DataFrame({"Дата": pd.to_datetime(["2024-01-06"]), "Курс USD": [97.5], "Курс EUR": [101.0]}))
+    assert store.previous("2024-01-06") == (date(2024, 1, 6), 97.5)
+    assert store._path != old_path, "Строки дописаны в файлы текущего поколения."
+    assert old_series.tolist() == [90.0, 91.0, 96.0]
+    assert os.path.getsize(os.path.join(old_path, "USD.f8")) == 3 * 8
+
+
+def test_previous_matches_rate_index(tmp_path):
+    """Для дат с пропущенным курсом хранилище и RateIndex дают одинаковый ответ."""
+    path = str(tmp_path / "dataset.csv")
+    write_csv(path, [("2024-01-02", 90.0, 98.0), ("2024-01-03", "", 99.0), ("2024-01-05", 96.0, "")],
+              1_700_000_000_000_000_000)
+    store, index = open_rate_store(path), RateIndex(path, "Курс USD")
+
+    for day in ["2024-01-01", "2024-01-03", "2024-01-04", "2024-01-05", "2024-01-20"]:
+        assert store.previous(day, max_lookback_days=10) == index.previous(day, max_lookback_days=10), day
@@ -0,0 +1,42 @@
+# background_job.py
+from PySide6.QtCore import QThread, Signal
+
+from partition import OperationCancelled
+
+
+class BackgroundJob(QThread):
+    """
+    Выполняет длительную операцию с датасетом в отдельном потоке.
+
+    Функция вызывается как func(*args, progress=..., should_stop=..., **kwargs):
+    progress(done, total) передает ход выполнения в сигнал progress,
+    should_stop() возвращает True после вызова cancel(). Сигналы
+    доставляются в поток интерфейса, поэтому их можно подключать
+    напрямую к виджетам.
+    """
+
+    progress = Signal(int, int)
+    succeeded = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, func, *args, parent=None, **kwargs):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def cancel(self):
+        """Запрашивает отмену; операция остановится перед записью следующего файла."""
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            result = self.func(*self.args, progress=self.progress.emit,
+                               should_stop=self.isInterruptionRequested, **self.kwargs)
+        except OperationCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.succeeded.emit(result)
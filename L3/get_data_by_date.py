@@ -1,14 +1,66 @@
-from datetime import datetime
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Union
 
-def get_data_by_date(data: dict, target_date: datetime) -> float:
+from rate_index import DATE_COLUMN, MAX_LOOKBACK_DAYS, RateIndex
+
+def get_data_by_date(data: Union[dict, RateIndex], target_date: datetime,
+                     max_lookback_days: int = MAX_LOOKBACK_DAYS) -> Optional[float]:
     """
-    Возвращает данные для указанной даты. Если данных для этой даты нет, возвращает None.
+    Возвращает данные для указанной даты.
+
+    Если на эту дату данных нет (выходной или праздник), возвращается
+    последнее значение за предыдущие дни, но не старше max_lookback_days.
 
-    :param data: Словарь, где ключ — это дата, а значение — данные.
+    :param data: Индекс курсов (RateIndex или RateStore) или словарь, где ключ — дата в формате 'YYYY-MM-DD', а значение — данные.
     :param target_date: Дата, для которой нужно получить данные.
+    :param max_lookback_days: Насколько дней назад можно искать данные.
     :return: Данные для указанной даты или None, если данных нет.
     """
-    # Преобразуем дату в строку в формате 'YYYY-MM-DD' для поиска в словаре
-    target_date_str = target_date.strftime('%Y-%m-%d')
-    # Возвращаем данные для указанной даты, если они есть, иначе None
-    return data.get(target_date_str, None)
+    if not isinstance(data, dict):
+        found = data.previous(target_date, max_lookback_days)
+        return found[1] if found is not None else None
+
+    # Преобразуем дату в строку в формате 'YYYY-MM-DD' для поиска в словаре, отступая назад по дням
+    for offset in range(max_lookback_days + 1):
+        target_date_str = (target_date - timedelta(days=offset)).strftime('%Y-%m-%d')
+        if target_date_str in data:
+            return data[target_date_str]
+    return None
+
+def get_data_by_dates(data: Union[dict, RateIndex], target_dates: Union[pd.Series, Iterable],
+                      max_lookback_days: int = MAX_LOOKBACK_DAYS) -> pd.Series:
+    """
+    Возвращает данные сразу для набора дат одним векторизованным вызовом.
+
+    Для каждой даты берется последнее известное значение на эту дату или
+    раньше (соединение pd.merge_asof назад по времени), но не старше
+    max_lookback_days дней. Порядок и количество результатов совпадают
+    с входными датами, повторы дат допускаются.
+
+    :param data: Индекс курсов (RateIndex или RateStore) или словарь, где ключ — дата в формате 'YYYY-MM-DD', а значение — данные.
+    :param target_dates: Даты (Series, DatetimeIndex, массив или список).
+    :param max_lookback_days: Максимальная давность значения в днях.
+    :return: Series со значениями (NaN, если данных нет); для Series на входе индекс сохраняется.
+    """
+    if not isinstance(data, dict):
+        rates = data.to_series()
+    else:
+        rates = pd.Series(data, dtype='float64')
+        rates.index = pd.to_datetime(rates.index)
+
+    index = target_dates.index if isinstance(target_dates, pd.Series) else None
+    dates = pd.to_datetime(pd.Series(np.asarray(target_dates))).dt.normalize().astype('datetime64[ns]')
+
+    # merge_asof требует отсортированных ключей без пропусков, исходный порядок восстанавливается по номеру
+    left = pd.DataFrame({DATE_COLUMN: dates.to_numpy(), 'position': np.arange(len(dates))})
+    left = left.dropna(subset=[DATE_COLUMN]).sort_values(DATE_COLUMN, kind='stable')
+    right = pd.DataFrame({DATE_COLUMN: rates.index.astype('datetime64[ns]'), 'value': rates.to_numpy()})
+    right = right.sort_values(DATE_COLUMN, kind='stable')
+
+    merged = pd.merge_asof(left, right, on=DATE_COLUMN, direction='backward',
+                           tolerance=pd.Timedelta(days=max_lookback_days))
+    values = np.full(len(dates), np.nan)
+    values[merged['position'].to_numpy()] = merged['value'].to_numpy()
+    return pd.Series(values, index=index, name=rates.name)
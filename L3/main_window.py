@@ -1,15 +1,15 @@
 # main_window.py
 from PySide6 import QtWidgets, QtCore
-from PySide6.QtWidgets import QMainWindow, QFileDialog, QPushButton, QLineEdit, QLabel
+from PySide6.QtWidgets import QMainWindow, QFileDialog, QPushButton, QLineEdit, QLabel, QProgressBar
 import sys
 import os
 
 from split_columns import split_csv_by_columns
-from split_by_year import split_dataset_by_years
-from split_by_week import split_dataset_by_weeks
+from partition import split_dataset_by_periods
 from get_data_by_date import get_data_by_date
 from datetime import datetime
-from manage_data import load_currency_data
+from rate_index import RateIndex
+from background_job import BackgroundJob
 
 CSV_SEP = ';'
 CSV_ENCODING = 'utf-8-sig'
@@ -18,7 +18,7 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Dataset Manager")
-        self.setGeometry(300, 300, 400, 300)
+        self.setGeometry(300, 300, 400, 360)
 
         # Кнопка выбора папки исходного датасета
         self.select_folder_button = QPushButton("Выбрать папку датасета", self)
@@ -45,6 +45,24 @@ class MainWindow(QMainWindow):
         self.get_data_button.clicked.connect(self.fetch_data_by_date)
         self.get_data_button.setGeometry(260, 200, 90, 30)
 
+        # Ход фоновой операции (аннотация или организация датасета) и ее отмена
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setGeometry(50, 250, 200, 30)
+        self.progress_bar.setValue(0)
+
+        self.cancel_button = QPushButton("Отменить", self)
+        self.cancel_button.clicked.connect(self.cancel_job)
+        self.cancel_button.setGeometry(260, 250, 90, 30)
+        self.cancel_button.setEnabled(False)
+
+        self.status_label = QLabel("", self)
+        self.status_label.setGeometry(50, 290, 300, 40)
+        self.status_label.setWordWrap(True)
+
+        # Индекс курсов создается при первом запросе и перечитывает файл только после его изменения
+        self.rate_index = None
+        self.job = None
+
     def select_folder(self):
         self.dataset_folder = QFileDialog.getExistingDirectory(self, 'Select Folder')
         if self.dataset_folder:
@@ -57,9 +75,11 @@ class MainWindow(QMainWindow):
 
         file_path, _ = QFileDialog.getSaveFileName(self, "Save Annotation File")
         if file_path:
-            # Вызов функции split_csv_by_columns и сохранение
-            split_csv_by_columns(os.path.join(self.dataset_folder, "dataset_v3.csv"))
-            print(f"Annotation file saved at: {file_path}")
+            # Вызов функции split_csv_by_columns в фоновом потоке
+            self.start_job(
+                f"Annotation file saved at: {file_path}",
+                split_csv_by_columns, os.path.join(self.dataset_folder, "dataset_v3.csv")
+            )
 
     def organize_dataset(self):
         if not hasattr(self, 'dataset_folder'):
@@ -68,10 +88,61 @@ class MainWindow(QMainWindow):
 
         destination_folder = QFileDialog.getExistingDirectory(self, "Select Destination Folder")
         if destination_folder:
-            # Вызов функций для организации датасета
-            split_dataset_by_years(os.path.join(self.dataset_folder, "dataset_v3.csv"), destination_folder)
-            split_dataset_by_weeks(os.path.join(self.dataset_folder, "dataset_v3.csv"), destination_folder)
-            print(f"Dataset organized in folder: {destination_folder}")
+            # Вызов функций для организации датасета в фоновом потоке
+            self.start_job(
+                f"Dataset organized in folder: {destination_folder}",
+                split_dataset_by_periods, os.path.join(self.dataset_folder, "dataset_v3.csv"),
+                ['year', 'week'], destination_folder
+            )
+
+    def start_job(self, success_message, func, *args):
+        """Запускает операцию в фоновом потоке; окно остается доступным."""
+        if self.job is not None:
+            self.show_status("Another operation is already running.")
+            return
+
+        self.job = BackgroundJob(func, *args, parent=self)
+        self.job.progress.connect(self.update_progress)
+        self.job.succeeded.connect(lambda _result: self.show_status(success_message))
+        self.job.failed.connect(lambda error: self.show_status(f"Error: {error}"))
+        self.job.cancelled.connect(lambda: self.show_status("Operation cancelled."))
+        self.job.finished.connect(self.job_finished)
+
+        self.progress_bar.setRange(0, 0)  # Пока датасет читается, полоса показывает занятость; total приходит с первым файлом
+        self.set_job_buttons_enabled(False)
+        self.show_status("Working...")
+        self.job.start()
+
+    def update_progress(self, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.cancel_button.setEnabled(False)
+
+    def job_finished(self):
+        self.job.deleteLater()
+        self.job = None
+        self.progress_bar.setRange(0, 100)
+        self.set_job_buttons_enabled(True)
+
+    def set_job_buttons_enabled(self, enabled):
+        self.create_annotation_button.setEnabled(enabled)
+        self.organize_dataset_button.setEnabled(enabled)
+        self.cancel_button.setEnabled(not enabled)
+
+    def show_status(self, message):
+        print(message)
+        self.status_label.setText(message)
+
+    def closeEvent(self, event):
+        # Дожидаемся фоновой операции, чтобы поток не был уничтожен во время записи файлов
+        if self.job is not None:
+            self.job.cancel()
+            self.job.wait()
+        super().closeEvent(event)
 
     def fetch_data_by_date(self):
         if not hasattr(self, 'dataset_folder') or not self.dataset_folder:
@@ -81,9 +152,10 @@ class MainWindow(QMainWindow):
         date_str = self.date_input.text()
         try:
             target_date = datetime.strptime(date_str, '%d.%m.%Y')
-            # Загрузим данные из уже разделенных файлов или словаря
-            currency_data = load_currency_data(os.path.join(self.dataset_folder, "dataset_v3.csv"))
-            result = get_data_by_date(currency_data, target_date)
+            dataset_path = os.path.join(self.dataset_folder, "dataset_v3.csv")
+            if self.rate_index is None or self.rate_index.filename != dataset_path:
+                self.rate_index = RateIndex(dataset_path)
+            result = get_data_by_date(self.rate_index, target_date)
             if result is not None:
                 print(f"Data for {date_str}: {result}")
             else:
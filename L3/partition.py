@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import time
+import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+from manage_data import load_dataset, create_directory
+
+# Константы
+CSV_SEP = ';'
+CSV_ENCODING = 'utf-8-sig'
+OUTPUT_DIRECTORY = 'Lab_2_tmpFiles'
+DEFAULT_MAX_WORKERS = 8  # Количество потоков записи файлов
+MANIFEST_FILENAME = 'partitions_manifest.json'  # Описание созданных файлов в директории
+
+# Гранулярность: (частота периода pandas, префикс имени файла, дополнительный столбец с началом периода)
+GRANULARITIES = {
+    'day': ('D', 'day', None),
+    'week': ('W', 'week', 'Неделя'),
+    'month': ('M', 'month', None),
+    'quarter': ('Q', 'quarter', None),
+    'year': ('Y', 'year', None),
+}
+
+
+class OperationCancelled(Exception):
+    """Разбиение прервано по запросу пользователя."""
+
+
+def _check_granularity(granularity: str) -> None:
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Неизвестная гранулярность '{granularity}'. Допустимые: {', '.join(GRANULARITIES)}.")
+
+
+def iter_partitions(df: pd.DataFrame, granularity: str) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Разбивает DataFrame на периоды за один проход groupby.
+
+    Периоды выдаются в порядке первого появления в данных, имя файла
+    строится по первой и последней дате периода, например
+    'year_20240101_20241005.csv'.
+
+    :param df: DataFrame со столбцом 'Дата' типа datetime64 без пропусков.
+    :param granularity: Одна из 'day', 'week', 'month', 'quarter', 'year'.
+    :return: Пары (имя файла, данные периода).
+    """
+    _check_granularity(granularity)
+    freq, prefix, period_column = GRANULARITIES[granularity]
+    periods = df['Дата'].dt.to_period(freq)
+    if period_column is not None:
+        df = df.assign(**{period_column: periods.dt.start_time})
+
+    for _, bucket in df.groupby(periods, sort=False):
+        start_date = bucket['Дата'].min().strftime('%Y%m%d')
+        end_date = bucket['Дата'].max().strftime('%Y%m%d')
+        yield f"{prefix}_{start_date}_{end_date}.csv", bucket
+
+
+def count_partitions(df: pd.DataFrame, granularity: str) -> int:
+    """Возвращает число периодов, которое выдаст iter_partitions, не строя сами периоды."""
+    _check_granularity(granularity)
+    return df['Дата'].dt.to_period(GRANULARITIES[granularity][0]).nunique()
+
+
+def write_partition(output_filename: str, bucket: pd.DataFrame) -> float:
+    """
+    Записывает один файл периода через временный файл и os.replace.
+
+    :return: Время записи в секундах.
+    """
+    start = time.perf_counter()
+    tmp_filename = f"{output_filename}.tmp"
+    bucket.to_csv(tmp_filename, sep=CSV_SEP, index=False, encoding=CSV_ENCODING)
+    os.replace(tmp_filename, output_filename)
+    return time.perf_counter() - start
+
+
+def write_partitions(partitions: Iterable[Tuple[str, pd.DataFrame]],
+                     max_workers: int = DEFAULT_MAX_WORKERS,
+                     progress: Optional[Callable[[int, int], None]] = None,
+                     should_stop: Optional[Callable[[], bool]] = None,
+                     total: Optional[int] = None) -> Dict[str, float]:
+    """
+    Записывает файлы периодов в пуле потоков.
+
+    Содержимое файлов совпадает с последовательной записью: каждый файл
+    пишется тем же вызовом to_csv, меняется только порядок завершения.
+    Периоды берутся из partitions по мере освобождения потоков, поэтому
+    в памяти одновременно не больше max_workers еще не записанных периодов.
+
+    :param partitions: Пары (путь к файлу, данные периода); может быть генератором.
+    :param max_workers: Максимальное число одновременно записываемых файлов.
+    :param progress: Вызывается после каждого файла с числом обработанных и общим числом файлов.
+    :param should_stop: Если возвращает True, новые периоды не берутся, а еще не
+        начатые файлы не записываются.
+    :param total: Общее число файлов для progress; обязателен, если partitions —
+        генератор (по умолчанию len(partitions)).
+    :return: Словарь {путь к файлу: время записи в секундах} в порядке периодов
+        (без пропущенных после отмены файлов).
+    """
+    def write(output_filename: str, bucket: pd.DataFrame) -> Optional[float]:
+        if should_stop is not None and should_stop():
+            return None
+        return write_partition(output_filename, bucket)
+
+    if total is None:
+        total = len(partitions)
+    partitions = iter(partitions)
+    pending = {}  # Future -> (номер периода, путь к файлу)
+    results = []
+    submitted = done = 0
+    exhausted = False
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # В работе не больше max_workers файлов: следующий период берется из partitions
+            # только после завершения одного из записываемых
+            while not exhausted and len(pending) < max_workers:
+                item = None if should_stop is not None and should_stop() else next(partitions, None)
+                if item is None:
+                    exhausted = True
+                    break
+                output_filename, bucket = item
+                pending[executor.submit(write, output_filename, bucket)] = (submitted, output_filename)
+                submitted += 1
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, output_filename = pending.pop(future)
+                elapsed = future.result()
+                if elapsed is not None:
+                    results.append((index, output_filename, elapsed))
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+    return {output_filename: elapsed for _, output_filename, elapsed in sorted(results)}
+
+
+def partition_hash(bucket: pd.DataFrame) -> str:
+    """Возвращает SHA-256 содержимого периода (названия столбцов и значения)."""
+    digest = hashlib.sha256("\x1f".join(map(str, bucket.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(bucket, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def load_manifest(directory: str) -> Dict[str, dict]:
+    """
+    Читает манифест директории: {имя файла: {'granularity', 'start', 'end', 'hash'}}.
+
+    Отсутствующий или поврежденный манифест считается пустым.
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST_FILENAME), encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(directory: str, manifest: Dict[str, dict]) -> None:
+    """Атомарно сохраняет манифест директории."""
+    path = os.path.join(directory, MANIFEST_FILENAME)
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def split_dataset_by_periods(input_filename: str, granularities: Union[Sequence[str], Mapping[str, str]],
+                             output_directory: str = OUTPUT_DIRECTORY,
+                             max_workers: int = DEFAULT_MAX_WORKERS,
+                             incremental: bool = False,
+                             progress: Optional[Callable[[int, int], None]] = None,
+                             should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, float]:
+    """
+    Разбивает исходный CSV-файл на файлы по нескольким периодам сразу.
+
+    Исходный файл читается и разбирается один раз, после чего из него
+    строятся все запрошенные наборы файлов, которые записываются
+    параллельно (см. write_partitions).
+
+    В каждой директории ведется манифест с диапазоном дат и хешем
+    содержимого каждого файла. В инкрементальном режиме перезаписываются
+    только периоды, содержимое которых изменилось; файлы периодов,
+    которые больше не строятся (например, неделя сменила дату окончания),
+    удаляются.
+
+    :param input_filename: Путь к исходному файлу CSV.
+    :param granularities: Список гранулярностей (все файлы сохраняются в
+        output_directory) или словарь {гранулярность: директория}.
+    :param output_directory: Путь к директории для сохранения результатов.
+    :param max_workers: Количество потоков записи.
+    :param incremental: Не перезаписывать файлы с неизменившимся содержимым.
+    :param progress: Вызывается после каждого периода (записанного или, в инкрементальном
+        режиме, пропущенного) с числом обработанных и общим числом периодов.
+    :param should_stop: Проверяется перед записью каждого файла; после отмены
+        манифесты не обновляются, и выбрасывается OperationCancelled.
+    :return: Словарь {путь к записанному файлу: время записи в секундах}.
+    """
+    if not isinstance(granularities, Mapping):
+        granularities = {granularity: output_directory for granularity in granularities}
+    for granularity in granularities:
+        _check_granularity(granularity)
+
+    df = load_dataset(input_filename)
+
+    # Убираем строки с некорректными датами
+    df = df.dropna(subset=['Дата'])
+
+    directories = set(granularities.values())
+    for directory in directories:
+        create_directory(directory)
+    old_manifests = {directory: load_manifest(directory) for directory in directories}
+    new_manifests = {directory: {} for directory in directories}
+    # Число периодов известно до записи, поэтому ход выполнения сообщается с первого файла
+    total = sum(count_partitions(df, granularity) for granularity in granularities)
+    processed = 0
+
+    def report(*_) -> None:
+        nonlocal processed
+        processed += 1
+        if progress is not None:
+            progress(processed, total)
+
+    def changed_partitions():
+        for granularity, directory in granularities.items():
+            for filename, bucket in iter_partitions(df, granularity):
+                digest = partition_hash(bucket)
+                new_manifests[directory][filename] = {
+                    'granularity': granularity,
+                    'start': bucket['Дата'].min().strftime('%Y-%m-%d'),
+                    'end': bucket['Дата'].max().strftime('%Y-%m-%d'),
+                    'hash': digest,
+                }
+                output_filename = os.path.join(directory, filename)
+                previous = old_manifests[directory].get(filename, {})
+                if incremental and previous.get('hash') == digest and os.path.exists(output_filename):
+                    report()
+                    continue
+                yield output_filename, bucket
+
+    timings = write_partitions(changed_partitions(), max_workers, report, should_stop, total)
+    if should_stop is not None and should_stop():
+        # Манифест не обновляется: при следующем запуске недописанные периоды будут записаны заново
+        raise OperationCancelled("Разбиение датасета отменено.")
+
+    for directory in directories:
+        processed = {granularity for granularity, path in granularities.items() if path == directory}
+        manifest = new_manifests[directory]
+        for filename, entry in old_manifests[directory].items():
+            if filename in manifest:
+                continue
+            if entry.get('granularity') in processed:
+                obsolete = os.path.join(directory, filename)
+                if os.path.exists(obsolete):
+                    os.remove(obsolete)
+            else:
+                manifest[filename] = entry
+        save_manifest(directory, manifest)
+
+    return timings
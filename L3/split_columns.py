@@ -1,19 +1,26 @@
 import os
 import pandas as pd
+from typing import Callable, Optional
 
 from manage_data import load_csv
 from manage_data import create_directory
+from partition import OperationCancelled
 
 CSV_SEP = ';'
 CSV_ENCODING = 'utf-8-sig'
 OUTPUT_DIRECTORY = 'Lab_2_tmpFiles'
 
-def split_csv_by_columns(input_filename: str, output_directory: str = OUTPUT_DIRECTORY) -> None:
+def split_csv_by_columns(input_filename: str, output_directory: str = OUTPUT_DIRECTORY,
+                         progress: Optional[Callable[[int, int], None]] = None,
+                         should_stop: Optional[Callable[[], bool]] = None) -> None:
     """
     Разбивает CSV-файл на два файла: X.csv (содержит даты) и Y.csv (содержит данные).
 
     :param input_filename: Путь к исходному файлу CSV.
     :param output_directory: Путь к директории для сохранения результатов.
+    :param progress: Вызывается после каждого файла с числом записанных и общим числом файлов.
+    :param should_stop: Проверяется перед записью каждого файла; если возвращает True,
+        выбрасывается OperationCancelled.
     """
     create_directory(output_directory)
 
@@ -22,8 +29,10 @@ def split_csv_by_columns(input_filename: str, output_directory: str = OUTPUT_DIR
     if 'Дата' not in df.columns or len(df.columns) != 2:
         raise ValueError("Файл должен содержать ровно две колонки: 'Дата' и 'Курс USD'.")
 
-    output_dates = os.path.join(output_directory, 'X.csv')
-    df[['Дата']].to_csv(output_dates, sep=CSV_SEP, index=False, encoding=CSV_ENCODING)
-
-    output_values = os.path.join(output_directory, 'Y.csv')
-    df[['Курс USD']].to_csv(output_values, sep=CSV_SEP, index=False, encoding=CSV_ENCODING)
+    outputs = [('X.csv', 'Дата'), ('Y.csv', 'Курс USD')]
+    for done, (filename, column) in enumerate(outputs, start=1):
+        if should_stop is not None and should_stop():
+            raise OperationCancelled("Создание аннотации отменено.")
+        df[[column]].to_csv(os.path.join(output_directory, filename), sep=CSV_SEP, index=False, encoding=CSV_ENCODING)
+        if progress is not None:
+            progress(done, len(outputs))
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+from manage_data import load_dataset
+from partition import count_partitions, split_dataset_by_periods
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+from background_job import BackgroundJob
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset_v3.csv")
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Приложение Qt для доставки сигналов."""
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def test_progress_reports_total_from_first_file(app, tmp_path):
+    """Первый же сигнал progress несет общее число файлов, последний — завершение."""
+    job = BackgroundJob(split_dataset_by_periods, DATASET, ['year', 'week'], str(tmp_path))
+    calls = []
+    job.progress.connect(lambda done, total: calls.append((done, total)))
+    job.run()  # Синхронно, в текущем потоке
+
+    df = load_dataset(DATASET).dropna(subset=['Дата'])
+    expected = count_partitions(df, 'year') + count_partitions(df, 'week')
+    assert calls, "Сигнал progress не отправлен."
+    assert calls[0] == (1, expected), "Общее число файлов неизвестно при первом сигнале."
+    assert calls[-1] == (expected, expected)
+
+
+def test_incremental_progress_counts_skipped_files(app, tmp_path):
+    """В инкрементальном режиме пропущенные файлы тоже продвигают progress."""
+    split_dataset_by_periods(DATASET, ['year'], str(tmp_path))
+    job = BackgroundJob(split_dataset_by_periods, DATASET, ['year'], str(tmp_path), incremental=True)
+    calls = []
+    job.progress.connect(lambda done, total: calls.append((done, total)))
+    job.run()
+
+    assert calls and calls[0][1] > 0 and calls[-1][0] == calls[-1][1], "Ход выполнения не дошел до конца."
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from quantile_sketch import sketch_of
+
 
 def calculate_monthly_average(df: pd.DataFrame, column: str) -> pd.Series:
     """
@@ -27,18 +29,20 @@ def calculate_monthly_average(df: pd.DataFrame, column: str) -> pd.Series:
     return df.groupby('месяц')[column].mean()
 
 
-def add_deviation_columns(df: pd.DataFrame, column: str) -> pd.DataFrame:
+def add_deviation_columns(df: pd.DataFrame, column: str, approximate: bool = False) -> pd.DataFrame:
     """
     Добавление столбцов с отклонениями от медианы и среднего.
 
     :param df: Исходный DataFrame.
     :param column: Название столбца для расчетов.
+    :param approximate: Считать медиану по эскизу квантилей вместо сортировки.
     :return: DataFrame с добавленными столбцами.
     """
     if column not in df or df[column].isnull().all():
         print(f"Столбец '{column}' пуст или отсутствует.")
         return df
 
-    df['отклонение_от_медианы'] = df[column] - df[column].median()
+    median = sketch_of(df[column].to_numpy()).median() if approximate else df[column].median()
+    df['отклонение_от_медианы'] = df[column] - median
     df['отклонение_от_среднего'] = df[column] - df[column].mean()
     return df
@@ -1,6 +1,14 @@
+import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# Эскиз квантилей и потоковый анализ берутся из общих модулей лабораторной
+# (в Colab загрузите quantile_sketch.py и streaming.py рядом с блокнотом)
+sys.path.append(os.pardir)
+from quantile_sketch import sketch_of
+from streaming import DEFAULT_CHUNKSIZE, stream_analysis
+
 
 def plot_graph(
     x: str, y: str, data: pd.DataFrame, title: str,
@@ -129,43 +137,65 @@ def calculate_monthly_average(df: pd.DataFrame, column: str) -> pd.Series:
     return df.groupby('месяц')[column].mean()
 
 
-def preprocess_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
+def preprocess_column(df: pd.DataFrame, column: str, approximate: bool = False) -> pd.DataFrame:
     """
     Преобразование и заполнение пропущенных значений в столбце.
 
     :param df: Исходный DataFrame.
     :param column: Название столбца для обработки.
+    :param approximate: Считать медиану для заполнения по эскизу квантилей
+        (один проход без сортировки, погрешность ранга около 1%).
     :return: Обработанный DataFrame.
     """
     df[column] = pd.to_numeric(df[column], errors='coerce')
     if df[column].isnull().all():
         print(f"Все значения в столбце '{column}' некорректны.")
         return df
-    df[column] = df[column].fillna(df[column].median())
+    median = sketch_of(df[column].to_numpy()).median() if approximate else df[column].median()
+    df[column] = df[column].fillna(median)
     return df
 
 
-def add_deviation_columns(df: pd.DataFrame, column: str) -> pd.DataFrame:
+def add_deviation_columns(df: pd.DataFrame, column: str, approximate: bool = False) -> pd.DataFrame:
     """
     Добавление столбцов с отклонениями от медианы и среднего.
 
     :param df: Исходный DataFrame.
     :param column: Название столбца для расчетов.
+    :param approximate: Считать медиану по эскизу квантилей вместо сортировки.
     :return: DataFrame с добавленными столбцами.
     """
     if column not in df or df[column].isnull().all():
         print(f"Столбец '{column}' пуст или отсутствует.")
         return df
-    df['отклонение_от_медианы'] = df[column] - df[column].median()
+    median = sketch_of(df[column].to_numpy()).median() if approximate else df[column].median()
+    df['отклонение_от_медианы'] = df[column] - median
     df['отклонение_от_среднего'] = df[column] - df[column].mean()
     return df
 
 
-def main(csv_path: str) -> None:
+def main_streaming(csv_path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> None:
+    """
+    Анализ данных без загрузки файла целиком (для данных больше объема памяти).
+
+    Выводит ту же статистику и средние по месяцам, что и main; квантили
+    (включая медиану) вычисляются приближенно. Графики не строятся.
+
+    :param csv_path: Путь к CSV файлу.
+    :param chunksize: Количество строк в одном чанке.
+    """
+    report = stream_analysis(csv_path, chunksize)
+    print(report.describe())
+    for column in report.aggregates:
+        print(f"Средние значения по месяцам ({column}):\n{report.monthly_average(column)}")
+
+
+def main(csv_path: str, approximate: bool = False) -> None:
     """
     Основная функция для анализа данных и визуализации.
 
     :param csv_path: Путь к CSV файлу.
+    :param approximate: Считать медиану по эскизу квантилей вместо сортировки.
     """
     # Загрузка данных
     df = pd.read_csv(csv_path, sep=';', encoding='utf-8-sig')
@@ -174,8 +204,8 @@ def main(csv_path: str) -> None:
     df.columns = [col.lower().replace(" ", "_") for col in df.columns]
 
     # Обработка данных
-    df = preprocess_column(df, 'курс_usd')
-    df = add_deviation_columns(df, 'курс_usd')
+    df = preprocess_column(df, 'курс_usd', approximate)
+    df = add_deviation_columns(df, 'курс_usd', approximate)
 
     # Вывод описательной статистики и гистограмма
     print(df.describe())
@@ -213,4 +243,5 @@ def main(csv_path: str) -> None:
 
 
 if __name__ == "__main__":
+    # Для файлов, не помещающихся в память: main_streaming("../dataset_v3.csv")
     main("../dataset_v3.csv")
\ No newline at end of file
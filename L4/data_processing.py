@@ -1,18 +1,28 @@
+import numpy as np
 import pandas as pd
+from typing import List, Optional, Sequence, Tuple
 
-def preprocess_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
+from quantile_sketch import sketch_of
+from storage import is_sorted_by_date
+
+DateBound = Optional[str]
+
+def preprocess_column(df: pd.DataFrame, column: str, approximate: bool = False) -> pd.DataFrame:
     """
     Преобразование и заполнение пропущенных значений в столбце.
 
     :param df: Исходный DataFrame.
     :param column: Название столбца для обработки.
+    :param approximate: Считать медиану для заполнения по эскизу квантилей
+        (один проход без сортировки, погрешность ранга около 1%).
     :return: Обработанный DataFrame.
     """
     df[column] = pd.to_numeric(df[column], errors='coerce')
     if df[column].isnull().all():
         print(f"Все значения в столбце '{column}' некорректны.")
         return df
-    df[column] = df[column].fillna(df[column].median())
+    median = sketch_of(df[column].to_numpy()).median() if approximate else df[column].median()
+    df[column] = df[column].fillna(median)
     return df
 
 
@@ -30,23 +40,87 @@ def filter_by_deviation(df: pd.DataFrame, deviation: float) -> pd.DataFrame:
     return df[abs(df['отклонение_от_среднего']) >= deviation]
 
 
+def _to_bound(value: DateBound) -> np.datetime64:
+    """Граница диапазона как datetime64[ns]; None или пустая строка — открытая граница (NaT)."""
+    if value is None or value == '':
+        return np.datetime64('NaT', 'ns')
+    return pd.to_datetime(value).to_datetime64().astype('datetime64[ns]')
+
+
+def date_range_positions(
+    dates: np.ndarray, ranges: Sequence[Tuple[DateBound, DateBound]]
+) -> List[slice]:
+    """
+    Возвращает позиции строк для каждого диапазона дат двоичным поиском.
+
+    Все границы ищутся одним вызовом np.searchsorted, поэтому запрос
+    стоит O(log n) на диапазон, а выборка — O(k) по числу строк в нем.
+
+    :param dates: Отсортированный массив datetime64[ns] (NaT в конце).
+    :param ranges: Пары (начальная дата, конечная дата) включительно;
+        None или пустая строка означают открытую границу.
+    :return: Срезы позиций, по одному на диапазон.
+    """
+    starts = np.array([_to_bound(start) for start, _ in ranges], dtype='datetime64[ns]')
+    ends = np.array([_to_bound(end) for _, end in ranges], dtype='datetime64[ns]')
+    # Открытый конец — до первой строки с NaT, открытое начало — с первой строки
+    lower = np.where(np.isnat(starts), 0, np.searchsorted(dates, starts, side='left'))
+    upper = np.searchsorted(dates, ends, side='right')
+    upper = np.where(np.isnat(ends), np.searchsorted(dates, np.datetime64('NaT', 'ns'), side='left'), upper)
+    return [slice(int(lo), int(max(lo, hi))) for lo, hi in zip(lower, upper)]
+
+
+def sort_by_date(df: pd.DataFrame, column: str = 'дата') -> pd.DataFrame:
+    """
+    Возвращает DataFrame с датами типа datetime64, упорядоченный по дате.
+
+    Данные из storage.load_dataset уже упорядочены: тогда выполняется
+    только проверка порядка за O(n), и DataFrame возвращается без
+    копирования. Иначе даты приводятся и строки сортируются в новом
+    DataFrame; переданный DataFrame не изменяется.
+    """
+    dates = df[column]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format='%Y/%m/%d')
+        df = df.assign(**{column: dates})
+    if not is_sorted_by_date(dates):
+        df = df.sort_values(column, kind='stable', na_position='last')
+    return df
+
+
 def filter_by_date_range(
-    df: pd.DataFrame, start_date: str, end_date: str
+    df: pd.DataFrame, start_date: DateBound = None, end_date: DateBound = None
 ) -> pd.DataFrame:
     """
     Фильтрация строк DataFrame по диапазону дат.
 
+    Диапазон выбирается срезом по позициям, найденным двоичным поиском
+    (см. date_range_positions). Данные из storage.load_dataset уже
+    упорядочены по дате; неупорядоченные сортируются при каждом вызове.
+
     :param df: Исходный DataFrame.
-    :param start_date: Начальная дата (YYYY-MM-DD).
-    :param end_date: Конечная дата (YYYY-MM-DD).
-    :return: Отфильтрованный DataFrame.
+    :param start_date: Начальная дата (YYYY-MM-DD), None — без ограничения.
+    :param end_date: Конечная дата (YYYY-MM-DD), None — без ограничения.
+    :return: Отфильтрованный DataFrame, отсортированный по дате.
+    """
+    return filter_by_date_ranges(df, [(start_date, end_date)])[0]
+
+
+def filter_by_date_ranges(
+    df: pd.DataFrame, ranges: Sequence[Tuple[DateBound, DateBound]]
+) -> List[pd.DataFrame]:
+    """
+    Фильтрация строк DataFrame сразу по нескольким диапазонам дат.
+
+    :param df: Исходный DataFrame.
+    :param ranges: Пары (начальная дата, конечная дата) включительно.
+    :return: Список DataFrame, по одному на диапазон.
     """
     try:
-        df['дата'] = pd.to_datetime(df['дата'], format='%Y/%m/%d')
-        start_date = pd.to_datetime(start_date)
-        end_date = pd.to_datetime(end_date)
+        df = sort_by_date(df)
+        positions = date_range_positions(df['дата'].to_numpy(dtype='datetime64[ns]'), ranges)
     except Exception as e:
         print(f"Ошибка преобразования даты: {e}")
-        return pd.DataFrame()
+        return [pd.DataFrame() for _ in ranges]
 
-    return df[(df['дата'] >= start_date) & (df['дата'] <= end_date)]
+    return [df.iloc[position] for position in positions]
@@ -1,36 +1,87 @@
-import pandas as pd
+import argparse
+import os
+from typing import Optional
+
+from storage import load_dataset
+from streaming import DEFAULT_CHUNKSIZE, stream_analysis
 from analysis import calculate_monthly_average, add_deviation_columns
 from visualization import plot_graph, plot_histogram
 from data_processing import preprocess_column, filter_by_date_range, filter_by_deviation
 
-def main(csv_path: str):
+def main_streaming(csv_path: str, chunksize: int = DEFAULT_CHUNKSIZE):
+    """
+    Анализ данных без загрузки файла целиком (для данных больше объема памяти).
+
+    Выводит ту же статистику и средние по месяцам, что и main; квантили
+    (включая медиану) вычисляются приближенно. Графики не строятся.
+
+    :param csv_path: Путь к CSV-файлу с данными.
+    :param chunksize: Количество строк в одном чанке.
+    """
+    report = stream_analysis(csv_path, chunksize)
+
+    # Вывод общей статистики
+    print(report.describe())
+
+    for column in report.aggregates:
+        print(f"Средние значения по месяцам ({column}):\n{report.monthly_average(column)}")
+
+
+def main(csv_path: str, approximate: bool = False, output_dir: Optional[str] = None):
     """
     Основная функция анализа данных.
 
     :param csv_path: Путь к CSV-файлу с данными.
+    :param approximate: Считать медиану по эскизу квантилей вместо сортировки.
+    :param output_dir: Папка для сохранения графиков в PNG без вывода на экран
+        (для запуска без дисплея, например в Docker). None — показать графики.
     """
-    df = pd.read_csv(csv_path, sep=';', encoding='utf-8-sig')
+    def output(name: str) -> Optional[str]:
+        return os.path.join(output_dir, name) if output_dir else None
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    df = load_dataset(csv_path)
     df.columns = [col.lower().replace(" ", "_") for col in df.columns]
-    df = preprocess_column(df, 'курс_usd')
-    df = add_deviation_columns(df, 'курс_usd')
+    df = preprocess_column(df, 'курс_usd', approximate)
+    df = add_deviation_columns(df, 'курс_usd', approximate)
 
-    # Вывод общей статистики
-    print(df.describe())
+    # Вывод общей статистики (только числовые столбцы: 'дата' уже имеет тип datetime64)
+    print(df.describe(include='number'))
 
     # Построение гистограммы
-    plot_histogram(df, 'курс_usd', "Распределение курса USD", "Курс USD", "Частота")
+    plot_histogram(df, 'курс_usd', "Распределение курса USD", "Курс USD", "Частота", output=output("histogram.png"))
 
     # Фильтрация и группировка
     filtered_df = filter_by_deviation(df, deviation=0.5)
     monthly_avg = calculate_monthly_average(df, 'курс_usd')
 
     # Построение графика изменения курса
-    plot_graph(x='дата', y='курс_usd', data=df, title="Изменение курса USD", xlabel="Дата", ylabel="Курс USD")
+    plot_graph(x='дата', y='курс_usd', data=df, title="Изменение курса USD", xlabel="Дата", ylabel="Курс USD",
+               output=output("rate.png"))
     print(f"Средние значения по месяцам:\n{monthly_avg}")
 
     # График за конкретный месяц
     month_df = df[df['дата'].dt.to_period("M") == "2024-04"]
-    plot_graph(x='дата', y='курс_usd', data=month_df, title="Курс USD за апрель 2024", xlabel="Дата", ylabel="Курс USD", mean=month_df['курс_usd'].mean(), median=month_df['курс_usd'].median())
+    plot_graph(x='дата', y='курс_usd', data=month_df, title="Курс USD за апрель 2024", xlabel="Дата", ylabel="Курс USD", mean=month_df['курс_usd'].mean(), median=month_df['курс_usd'].median(), output=output("rate_2024_04.png"))
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(description="Анализ курса USD.")
+    parser.add_argument("csv_path", nargs="?", default="dataset_v3.csv", help="Путь к CSV-файлу с данными.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Потоковый анализ по частям файла, без загрузки в память целиком.")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Строк в одном чанке.")
+    parser.add_argument("--approximate", action="store_true",
+                        help="Приближенная медиана для заполнения пропусков и отклонений.")
+    parser.add_argument("--output-dir", help="Сохранить графики в PNG в указанную папку вместо показа на экране.")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    main("dataset_v3.csv")
+    args = parse_args()
+    if args.stream:
+        main_streaming(args.csv_path, args.chunksize)
+    else:
+        main(args.csv_path, args.approximate, args.output_dir)
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Без pyarrow набор данных всегда читается из CSV
+    pa = pq = None
+
+# Константы
+CSV_SEP = ';'
+CSV_ENCODING = 'utf-8-sig'
+DATE_COLUMN = 'Дата'
+COLUMNAR_SUFFIX = '.parquet'
+SOURCE_METADATA_KEY = b'source_csv'
+
+
+def columnar_path(csv_path: str) -> str:
+    """Возвращает путь к бинарной копии CSV-файла (dataset_v3.csv -> dataset_v3.parquet)."""
+    return os.path.splitext(csv_path)[0] + COLUMNAR_SUFFIX
+
+
+def is_sorted_by_date(dates: pd.Series) -> bool:
+    """Проверяет за O(n), что даты идут по возрастанию, а NaT — только в конце."""
+    valid = dates.notna()
+    return valid.is_monotonic_decreasing and dates[valid].is_monotonic_increasing
+
+
+def sort_by_date_column(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Упорядочивает строки по столбцу даты (NaT в конце).
+
+    Уже упорядоченный DataFrame возвращается без копирования.
+    """
+    for column in df.columns:
+        if column.lower() == DATE_COLUMN.lower() and not is_sorted_by_date(df[column]):
+            return df.sort_values(column, kind='stable', na_position='last', ignore_index=True)
+    return df
+
+
+def read_typed_csv(csv_path: str) -> pd.DataFrame:
+    """
+    Читает CSV-файл, приводит столбец даты к datetime64 и сортирует строки по нему.
+
+    Столбец даты ищется без учета регистра ('Дата' или 'дата'),
+    некорректные даты превращаются в NaT и переносятся в конец.
+    """
+    df = pd.read_csv(csv_path, sep=CSV_SEP, encoding=CSV_ENCODING)
+    for column in df.columns:
+        if column.lower() == DATE_COLUMN.lower():
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+    return sort_by_date_column(df)
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_source_signature(path: str):
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        return json.loads(metadata[SOURCE_METADATA_KEY])
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None
+
+
+def save_columnar(df: pd.DataFrame, csv_path: str) -> None:
+    """
+    Сохраняет типизированный DataFrame в Parquet рядом с CSV-файлом.
+
+    В метаданные файла записываются время изменения, размер и SHA-256
+    исходного CSV, чтобы при чтении определить, не устарела ли копия.
+    Файл пишется во временный и подменяется атомарно.
+    """
+    stat = os.stat(csv_path)
+    signature = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': _file_hash(csv_path)}
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SOURCE_METADATA_KEY] = json.dumps(signature).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    path = columnar_path(csv_path)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_dataset(csv_path: str) -> pd.DataFrame:
+    """
+    Загружает набор данных с типизированным столбцом даты, строки
+    упорядочены по дате (файлы хранятся от новых дат к старым, а выборка
+    диапазона дат двоичным поиском требует возрастающего порядка).
+
+    Если рядом с CSV лежит актуальная Parquet-копия, читается она: типы
+    уже сохранены, и повторный разбор текста и дат не нужен. Копия
+    считается актуальной, если совпадают время изменения и размер CSV,
+    либо, при отличающемся времени, его SHA-256. Иначе CSV читается
+    заново и копия перезаписывается. Без pyarrow всегда читается CSV.
+
+    :param csv_path: Путь к CSV-файлу.
+    :return: DataFrame со столбцом даты типа datetime64, отсортированный по дате.
+    """
+    if pq is None:
+        return read_typed_csv(csv_path)
+
+    path = columnar_path(csv_path)
+    if os.path.exists(path):
+        signature = _read_source_signature(path)
+        stat = os.stat(csv_path)
+        if signature and signature['size'] == stat.st_size and (
+            signature['mtime_ns'] == stat.st_mtime_ns or signature['sha256'] == _file_hash(csv_path)
+        ):
+            # Копия, сохраненная до сортировки при загрузке, упорядочивается здесь
+            return sort_by_date_column(pq.read_table(path).to_pandas())
+
+    df = read_typed_csv(csv_path)
+    try:
+        save_columnar(df, csv_path)
+    except OSError as e:
+        print(f"Не удалось сохранить бинарную копию {path}: {e}")
+    return df
@@ -0,0 +1,212 @@
+import math
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+
+from quantile_sketch import DEFAULT_K, KLLSketch, merge_sketches
+
+# Константы
+CSV_SEP = ';'
+CSV_ENCODING = 'utf-8-sig'
+DATE_COLUMN = 'дата'
+RATE_COLUMN_PREFIX = 'курс_'
+DEFAULT_CHUNKSIZE = 100_000  # Строк в одном чанке
+DESCRIBE_QUANTILES = [0.25, 0.5, 0.75]
+
+
+class ColumnAggregate:
+    """
+    Объединяемые агрегаты одного числового столбца: количество, сумма,
+    сумма квадратов, минимум, максимум, число пропусков, эскиз квантилей
+    и частичные суммы по месяцам.
+
+    Агрегаты разных чанков или файлов складываются методом merge,
+    поэтому исходные данные целиком в памяти не нужны.
+    """
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.count = 0
+        self.nulls = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.sketch = KLLSketch(k, seed=0)
+        self.monthly_sum = pd.Series(dtype=float)
+        self.monthly_count = pd.Series(dtype=float)
+        self.monthly_nulls = pd.Series(dtype=float)
+
+    def update(self, values: pd.Series, months: Optional[pd.Series] = None) -> None:
+        """Добавляет значения чанка; months — месяц каждой строки (Period) для средних по месяцам."""
+        numeric = pd.to_numeric(values, errors='coerce').astype('float64')
+        valid = numeric.dropna()
+        self.count += len(valid)
+        self.nulls += len(numeric) - len(valid)
+        self.total += float(valid.sum())
+        self.total_sq += float((valid ** 2).sum())
+        self.sketch.update(valid.to_numpy())
+
+        if months is not None:
+            grouped = numeric.groupby(months)
+            self.monthly_sum = self.monthly_sum.add(grouped.sum(), fill_value=0)
+            self.monthly_count = self.monthly_count.add(grouped.count(), fill_value=0)
+            self.monthly_nulls = self.monthly_nulls.add(numeric.isnull().groupby(months).sum(), fill_value=0)
+
+    def merge(self, other: 'ColumnAggregate') -> 'ColumnAggregate':
+        """Добавляет агрегаты другой части данных и возвращает self."""
+        self.count += other.count
+        self.nulls += other.nulls
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.sketch.merge(other.sketch)
+        self.monthly_sum = self.monthly_sum.add(other.monthly_sum, fill_value=0)
+        self.monthly_count = self.monthly_count.add(other.monthly_count, fill_value=0)
+        self.monthly_nulls = self.monthly_nulls.add(other.monthly_nulls, fill_value=0)
+        return self
+
+    def fill_missing(self, value: float) -> None:
+        """
+        Учитывает заполнение пропусков значением value, как это делает
+        preprocess_column: пропуски становятся обычными значениями.
+        """
+        if self.nulls == 0 or math.isnan(value):
+            return
+        self.count += self.nulls
+        self.total += self.nulls * value
+        self.total_sq += self.nulls * value ** 2
+        self.sketch.update(np.full(self.nulls, value))
+        self.monthly_sum = self.monthly_sum.add(self.monthly_nulls * value, fill_value=0)
+        self.monthly_count = self.monthly_count.add(self.monthly_nulls, fill_value=0)
+        self.monthly_nulls = self.monthly_nulls * 0
+        self.nulls = 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    @property
+    def std(self) -> float:
+        """Выборочное стандартное отклонение (ddof=1, как у describe)."""
+        if self.count < 2:
+            return math.nan
+        variance = (self.total_sq - self.total ** 2 / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def describe(self, shift: float = 0.0) -> pd.Series:
+        """
+        Возвращает статистику в формате DataFrame.describe.
+
+        :param shift: Значение, вычитаемое из всех данных (для столбцов отклонений).
+        """
+        quantiles = self.sketch.quantile(DESCRIBE_QUANTILES)
+        values = [self.count, self.mean, self.std, self.sketch.min, *quantiles, self.sketch.max]
+        index = ['count', 'mean', 'std', 'min'] + [f"{q:.0%}" for q in DESCRIBE_QUANTILES] + ['max']
+        result = pd.Series(values, index=index, dtype=float)
+        result[['mean', 'min', '25%', '50%', '75%', 'max']] -= shift
+        return result
+
+    def monthly_average(self) -> pd.Series:
+        """Средние значения по месяцам."""
+        result = (self.monthly_sum / self.monthly_count).sort_index()
+        result.index.name = 'месяц'
+        return result
+
+
+class StreamingReport:
+    """Результат потокового анализа: агрегаты по каждому столбцу курса."""
+
+    def __init__(self, aggregates: Dict[str, ColumnAggregate]):
+        self.aggregates = aggregates
+
+    def describe(self) -> pd.DataFrame:
+        """
+        Статистика в формате df.describe() для столбцов курсов и их отклонений
+        от медианы и среднего (как после add_deviation_columns).
+
+        Отклонение — сдвиг столбца на константу (количество и std не
+        меняются), поэтому его статистика получается из тех же агрегатов
+        без второго прохода по данным.
+        """
+        columns = {}
+        for column, aggregate in self.aggregates.items():
+            suffix = '' if len(self.aggregates) == 1 else f"_{column}"
+            columns[column] = aggregate.describe()
+            columns[f"отклонение_от_медианы{suffix}"] = aggregate.describe(shift=aggregate.sketch.median())
+            columns[f"отклонение_от_среднего{suffix}"] = aggregate.describe(shift=aggregate.mean)
+        return pd.DataFrame(columns)
+
+    def monthly_average(self, column: str) -> pd.Series:
+        return self.aggregates[column].monthly_average()
+
+    def median(self, column: str) -> float:
+        return self.aggregates[column].sketch.median()
+
+
+def iter_chunks(csv_path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterable[pd.DataFrame]:
+    """Читает CSV по частям, приводя названия столбцов к виду 'курс_usd'."""
+    for chunk in pd.read_csv(csv_path, sep=CSV_SEP, encoding=CSV_ENCODING, chunksize=chunksize):
+        chunk.columns = [col.lower().replace(" ", "_") for col in chunk.columns]
+        yield chunk
+
+
+def column_sketch(csv_path: str, column: str, chunksize: int = DEFAULT_CHUNKSIZE, k: int = DEFAULT_K) -> KLLSketch:
+    """Эскиз квантилей одного столбца CSV-файла, построенный по чанкам."""
+    sketch = KLLSketch(k, seed=0)
+    for chunk in iter_chunks(csv_path, chunksize):
+        sketch.update(pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype='float64'))
+    return sketch
+
+
+def partition_quantiles(
+    csv_paths: List[str], column: str, q=0.5, chunksize: int = DEFAULT_CHUNKSIZE, k: int = DEFAULT_K
+):
+    """
+    Квантили столбца по нескольким файлам (например, годовым разбиениям).
+
+    Для каждого файла строится свой эскиз, после чего эскизы
+    объединяются: файлы не склеиваются в один DataFrame.
+
+    :param csv_paths: Пути к CSV-файлам.
+    :param column: Название столбца ('курс_usd').
+    :param q: Уровень квантиля или список уровней (0.5 — медиана).
+    :param chunksize: Количество строк в чанке.
+    :param k: Точность эскиза.
+    :return: Значение квантиля или массив значений.
+    """
+    return merge_sketches((column_sketch(path, column, chunksize, k) for path in csv_paths), k).quantile(q)
+
+
+def stream_analysis(
+    csv_paths, chunksize: int = DEFAULT_CHUNKSIZE, columns: Optional[List[str]] = None,
+    k: int = DEFAULT_K, fill_missing: bool = True
+) -> StreamingReport:
+    """
+    Потоковый анализ одного или нескольких CSV-файлов.
+
+    Файлы читаются чанками по chunksize строк, в памяти остаются только
+    агрегаты (см. ColumnAggregate), поэтому размер данных не ограничен
+    объемом памяти. Несколько файлов (например, годовые разбиения)
+    обрабатываются как один набор данных.
+
+    :param csv_paths: Путь к CSV-файлу или список путей.
+    :param chunksize: Количество строк в чанке.
+    :param columns: Столбцы для анализа (None — все столбцы 'курс_*').
+    :param k: Точность эскиза квантилей.
+    :param fill_missing: Заполнять пропуски медианой, как preprocess_column.
+    :return: Отчет с агрегатами по столбцам.
+    """
+    if isinstance(csv_paths, str):
+        csv_paths = [csv_paths]
+
+    aggregates: Dict[str, ColumnAggregate] = {}
+    for csv_path in csv_paths:
+        for chunk in iter_chunks(csv_path, chunksize):
+            months = None
+            if DATE_COLUMN in chunk:
+                months = pd.to_datetime(chunk[DATE_COLUMN], errors='coerce').dt.to_period('M').rename('месяц')
+            selected = columns or [col for col in chunk.columns if col.startswith(RATE_COLUMN_PREFIX)]
+            for column in selected:
+                aggregates.setdefault(column, ColumnAggregate(k)).update(chunk[column], months)
+
+    if fill_missing:
+        for aggregate in aggregates.values():
+            aggregate.fill_missing(aggregate.sketch.median())
+    return StreamingReport(aggregates)
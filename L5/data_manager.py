@@ -1,86 +1,377 @@
 import os
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from quantile_sketch import KLLSketch, sketch_of
+from rolling import RollingWindow
+from running_stats import DESCRIBE_QUANTILES, RunningStats
+from storage import load_dataset
 
 # Константы
 DEFAULT_FILE_NAME = "dataset_v3.csv"
 CSV_SEPARATOR = ";"
 ENCODING = "utf-8-sig"
 DATE_COLUMN = "дата"
+RATE_COLUMN_PREFIX = "курс_"
+PREVIEW_ROWS = 10  # Строк в окнах с результатами
 
 
 class DataManager:
-    """Класс для работы с данными."""
+    """
+    Класс для работы с данными.
+
+    Данные хранятся в одном типизированном DataFrame: при присваивании
+    self.data столбец даты один раз приводится к datetime64, столбцы
+    курсов — к float64, строки сортируются по дате, и дата становится
+    индексом (столбец даты при этом сохраняется). Методы не копируют
+    набор данных и не разбирают даты повторно; результаты фильтров
+    являются выборками из общего DataFrame, и копия создается только
+    по запросу (copy=True), если вызывающей стороне нужно изменять результат.
+
+    Производные результаты (статистика, средние по месяцам, отклонения)
+    запоминаются по ключу (операция, столбец, версия данных). Версия
+    увеличивается при каждом присваивании self.data и при очистке
+    столбца на месте; после прямого изменения столбцов self.data нужно
+    вызвать invalidate_cache(). Запомненные результаты общие для всех
+    вызовов, изменять их нельзя.
+
+    Новые дни добавляются методом append: скользящие показатели (rolling)
+    при этом не пересчитываются целиком, а досчитываются по хвостовому окну,
+    а общая статистика (get_summary) обновляется онлайн (см. RunningStats;
+    точные квартили пересчитываются по всему столбцу).
+    """
 
     def __init__(self, file_name: str = DEFAULT_FILE_NAME):
         self.file_name = file_name
+        self._version = 0
+        self._cache: Dict[Tuple[str, Hashable, int], Any] = {}
+        self._rolling: Dict[Tuple[str, int, Optional[int], Optional[int]], RollingWindow] = {}
+        self._stats: Dict[str, RunningStats] = {}
         self.data = None
 
-    def load_csv(self, folder: str) -> Optional[pd.DataFrame]:
-        """Загружает данные из CSV-файла."""
+    @property
+    def data(self) -> Optional[pd.DataFrame]:
+        return self._data
+
+    @data.setter
+    def data(self, df: Optional[pd.DataFrame]) -> None:
+        self._data = self._prepare(df) if df is not None else None
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        """Сбрасывает запомненные результаты (увеличивает версию данных)."""
+        self._version += 1
+        self._cache.clear()
+        self._rolling.clear()
+        # Новый словарь, а не clear(): append сохраняет ссылку на прежнюю статистику и возвращает ее
+        self._stats = {}
+
+    def _cached(self, operation: str, column: Hashable, compute: Callable[[], Any]) -> Any:
+        """Возвращает запомненный результат операции или вычисляет и запоминает его."""
+        key = (operation, column, self._version)
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @staticmethod
+    def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Приводит типы столбцов, сортирует строки по дате и делает дату индексом.
+
+        Изменяется поверхностная копия: переданный DataFrame остается прежним,
+        а неизменившиеся столбцы не копируются.
+        """
+        df = df.copy(deep=False)
+        for column in df.columns:
+            if column.startswith(RATE_COLUMN_PREFIX) and not pd.api.types.is_float_dtype(df[column]):
+                df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+
+        if DATE_COLUMN in df:
+            if not pd.api.types.is_datetime64_any_dtype(df[DATE_COLUMN]):
+                df[DATE_COLUMN] = pd.to_datetime(df[DATE_COLUMN], errors="coerce")
+            if not df[DATE_COLUMN].is_monotonic_increasing:
+                df = df.sort_values(DATE_COLUMN, kind="stable", na_position="last")
+            # Индекс без имени, чтобы 'дата' однозначно обозначала столбец
+            df.index = pd.DatetimeIndex(df[DATE_COLUMN].to_numpy())
+        return df
+
+    def load_csv(self, folder: str, copy: bool = True) -> Optional[pd.DataFrame]:
+        """
+        Загружает данные из CSV-файла.
+
+        Используется актуальная Parquet-копия файла, если она есть (см. storage.load_dataset).
+
+        :param folder: Папка с файлом набора данных.
+        :param copy: Вернуть копию (по умолчанию). False — вернуть общий DataFrame
+            без копирования; изменять его нельзя (см. invalidate_cache).
+        """
         file_path = os.path.join(folder, self.file_name)
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Файл {file_path} не найден")
 
-        self.data = pd.read_csv(file_path, sep=CSV_SEPARATOR, encoding=ENCODING)
-        self._normalize_columns()
-        return self.data.copy()
+        self.data = self._normalize_columns(load_dataset(file_path))
+        return self.data.copy() if copy else self.data
 
-    def _normalize_columns(self):
+    @staticmethod
+    def preview(df: pd.DataFrame, rows: int = PREVIEW_ROWS) -> pd.DataFrame:
+        """
+        Возвращает строки для показа пользователю.
+
+        Данные хранятся по возрастанию дат, а показываются, как в исходном
+        файле: сначала последние даты. Индекс дат заменяется номерами строк,
+        чтобы дата не выводилась дважды.
+        """
+        return df.tail(rows).iloc[::-1].reset_index(drop=True)
+
+    @staticmethod
+    def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
         """Приводит названия колонок к нижнему регистру с разделением слов через `_`."""
-        if self.data is not None:
-            self.data.columns = [col.lower().replace(" ", "_") for col in self.data.columns]
+        df.columns = [col.lower().replace(" ", "_") for col in df.columns]
+        return df
+
+    @staticmethod
+    def _median(values: pd.Series, approximate: bool = False) -> float:
+        """Медиана без учета пропусков: точная или по эскизу квантилей (один проход без сортировки)."""
+        return sketch_of(values.to_numpy(dtype="float64")).median() if approximate else values.median()
+
+    def append(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Добавляет новые строки (например, курс за очередной день) в конец данных.
+
+        Если даты новых строк не раньше последней даты набора, строки
+        дописываются в конец, а скользящие показатели досчитываются только
+        для них по хвостовому окну. Иначе данные сортируются заново и
+        скользящие показатели пересчитываются. Общая статистика от порядка
+        строк не зависит и в обоих случаях обновляется только по новым
+        строкам. Остальные запомненные результаты сбрасываются.
+
+        :param rows: Новые строки с теми же столбцами.
+        :return: Обновленные данные.
+        """
+        rows = self._prepare(self._normalize_columns(rows.copy()))
+        if self.data is None:
+            self.data = rows
+            return self.data
 
-    def clean_column(self, column: str) -> pd.DataFrame:
-        """Обрабатывает невалидные значения в указанном столбце."""
+        stats = self._stats
+        if self._follows(rows):
+            self._data = pd.concat([self.data, rows])
+            self._version += 1
+            self._cache.clear()
+            for (column, *_), engine in self._rolling.items():
+                engine.update(rows[column] if column in rows else pd.Series(np.nan, index=rows.index))
+        else:
+            self.data = pd.concat([self.data, rows])
+
+        self._stats = stats
+        for column, running in stats.items():
+            if column in rows:
+                running.update(self._as_numbers(rows[column]))
+        return self.data
+
+    def _follows(self, rows: pd.DataFrame) -> bool:
+        """Можно ли дописать строки в конец, не нарушив порядок дат."""
+        if DATE_COLUMN not in self.data or DATE_COLUMN not in rows:
+            return DATE_COLUMN not in self.data and DATE_COLUMN not in rows
+        if rows.empty or self.data.empty:
+            return True
+        last, first = self.data[DATE_COLUMN].iloc[-1], rows[DATE_COLUMN].iloc[0]
+        return pd.notna(last) and pd.notna(first) and first >= last
+
+    def clean_column(self, column: str, inplace: bool = False, approximate: bool = False) -> pd.DataFrame:
+        """
+        Обрабатывает невалидные значения в указанном столбце.
+
+        :param column: Название столбца.
+        :param inplace: Записать очищенный столбец в self.data (сбрасывает запомненные результаты).
+        :param approximate: Заполнять пропуски приближенной медианой (см. get_quantiles).
+        """
         if self.data is not None:
-            df = self.data.copy()
-            df[column] = pd.to_numeric(df[column], errors="coerce")
-            if df[column].isnull().any():
-                print(f"Найдено {df[column].isnull().sum()} невалидных значений в '{column}'.")
-                df[column] = df[column].fillna(df[column].median())
-            return df
+            values = pd.to_numeric(self.data[column], errors="coerce")
+            if values.isnull().any():
+                print(f"Найдено {values.isnull().sum()} невалидных значений в '{column}'.")
+                values = values.fillna(self._median(values, approximate))
+            if inplace:
+                self.data[column] = values
+                self.invalidate_cache()
+                return self.data
+            return self.data.assign(**{column: values})
         return pd.DataFrame()
 
-    def add_deviations(self, column: str) -> pd.DataFrame:
-        """Добавляет столбцы с отклонениями от медианы и среднего."""
+    def add_deviations(self, column: str, approximate: bool = False) -> pd.DataFrame:
+        """
+        Добавляет столбцы с отклонениями от медианы и среднего.
+
+        :param column: Название столбца.
+        :param approximate: Считать медиану по эскизу квантилей вместо сортировки.
+        """
         if self.data is not None and column in self.data:
-            df = self.data.copy()
-            df["median_dev"] = df[column] - df[column].median()
-            df["mean_dev"] = df[column] - df[column].mean()
-            return df
+            def compute() -> pd.DataFrame:
+                values = self.data[column]
+                median = self._median(values, approximate)
+                return self.data.assign(median_dev=values - median, mean_dev=values - values.mean())
+            return self._cached("deviations", (column, approximate), compute)
         return pd.DataFrame()
 
-    def get_summary(self) -> pd.DataFrame:
-        """Возвращает статистику данных."""
+    def get_quantiles(self, column: str, q: Sequence[float] = (0.25, 0.5, 0.75),
+                      approximate: bool = False) -> pd.Series:
+        """
+        Возвращает квантили столбца.
+
+        В приближенном режиме по столбцу один раз строится эскиз KLL
+        (память O(k), ошибка ранга около 1%), и последующие запросы
+        любых квантилей отвечаются по нему до изменения данных.
+
+        :param column: Название столбца.
+        :param q: Уровни квантилей от 0 до 1.
+        :param approximate: Использовать эскиз вместо точного расчета.
+        :return: Series со значениями квантилей, индекс — уровни.
+        """
+        if self.data is None or column not in self.data:
+            return pd.Series(dtype=float)
+        if not approximate:
+            return self.data[column].quantile(list(q))
+        sketch = self._cached("sketch", column, lambda: self.column_sketch(column))
+        return pd.Series(sketch.quantile(list(q)), index=list(q), name=column)
+
+    def column_sketch(self, column: str) -> KLLSketch:
+        """
+        Строит эскиз квантилей столбца.
+
+        Эскизы разных наборов данных (например, годовых разбиений)
+        объединяются методом KLLSketch.merge, что дает медиану и квантили
+        по всем данным без их объединения в один DataFrame.
+        """
+        return sketch_of(pd.to_numeric(self.data[column], errors="coerce").to_numpy(dtype="float64"))
+
+    def rolling(self, column: str, window: int, span: Optional[int] = None,
+                min_periods: Optional[int] = None) -> pd.DataFrame:
+        """
+        Скользящие показатели столбца: среднее, стандартное отклонение,
+        минимум, максимум, z-оценка и EWMA (см. rolling.RollingWindow).
+
+        Считаются за O(n) через кумулятивные суммы и запоминаются; после
+        append досчитываются только новые строки.
+
+        :param column: Название столбца.
+        :param window: Размер окна в строках (днях).
+        :param span: Период EWMA, по умолчанию равен window.
+        :param min_periods: Минимум значений в окне, по умолчанию window.
+        :return: DataFrame с индексом данных и столбцами rolling_mean,
+            rolling_std, rolling_min, rolling_max, zscore, ewma.
+        """
+        if self.data is None or column not in self.data:
+            return pd.DataFrame()
+        key = (column, window, span, min_periods)
+        if key not in self._rolling:
+            engine = RollingWindow(window, span, min_periods)
+            engine.update(self.data[column])
+            self._rolling[key] = engine
+        return self._rolling[key].result
+
+    def get_summary(self, approximate: bool = False) -> pd.DataFrame:
+        """
+        Возвращает статистику данных в формате DataFrame.describe.
+
+        Только количество, среднее, стандартное отклонение, минимум и
+        максимум числовых столбцов и столбца даты обновляются за O(1) на
+        строку: они берутся из состояния RunningStats, которое строится при
+        первом вызове и затем обновляется методом append. Точные квартили
+        (по умолчанию) после каждого изменения данных пересчитываются
+        проходом по всему столбцу — O(n). Без прохода по данным статистика
+        целиком получается только с approximate=True.
+
+        :param approximate: Брать квартили из эскиза квантилей, который
+            обновляется вместе с RunningStats (погрешность ранга около 1%).
+        """
         if self.data is not None:
-            return self.data.describe()
+            return self._cached("summary", approximate, lambda: self._summary_from_stats(approximate))
         return pd.DataFrame()
 
-    def filter_by_deviation(self, threshold: float) -> pd.DataFrame:
+    def _summary_from_stats(self, approximate: bool = False) -> pd.DataFrame:
+        columns = self.data.select_dtypes(include=["number", "datetime"]).columns
+        if columns.empty:
+            return self.data.describe()
+        summary = {}
+        for column in columns:
+            if column not in self._stats:
+                self._stats[column] = RunningStats()
+                self._stats[column].update(self._as_numbers(self.data[column]))
+            is_date = pd.api.types.is_datetime64_any_dtype(self.data[column])
+            quartiles = None
+            if not approximate:
+                values = self._as_numbers(self.data[column])
+                quartiles = np.nanquantile(values, DESCRIBE_QUANTILES) if self._stats[column].count else None
+            summary[column] = self._stats[column].describe(as_datetime=is_date, quartiles=quartiles)
+        return pd.DataFrame(summary)
+
+    @staticmethod
+    def _as_numbers(values: pd.Series) -> np.ndarray:
+        """Значения столбца как float64; даты — в наносекундах, NaT — NaN."""
+        if pd.api.types.is_datetime64_any_dtype(values):
+            dates = values.to_numpy(dtype="datetime64[ns]")
+            return np.where(np.isnat(dates), np.nan, dates.astype("int64").astype("float64"))
+        return pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64")
+
+    def filter_by_deviation(self, threshold: float, copy: bool = False) -> pd.DataFrame:
         """Фильтрует строки по заданному отклонению от среднего."""
         if self.data is not None and "mean_dev" in self.data:
-            df = self.data.copy()
-            return df[abs(df["mean_dev"]) >= threshold]
+            result = self.data[self.data["mean_dev"].abs() >= threshold]
+            return result.copy() if copy else result
         return pd.DataFrame()
 
-    def filter_by_dates(self, start: str, end: str) -> pd.DataFrame:
-        """Фильтрует строки по диапазону дат."""
-        if self.data is not None and DATE_COLUMN in self.data:
-            df = self.data.copy()
-            df[DATE_COLUMN] = pd.to_datetime(df[DATE_COLUMN], errors="coerce")
-            start = pd.to_datetime(start)
-            end = pd.to_datetime(end)
-            return df[(df[DATE_COLUMN] >= start) & (df[DATE_COLUMN] <= end)]
-        return pd.DataFrame()
+    def filter_by_dates(self, start: Optional[str] = None, end: Optional[str] = None,
+                        copy: bool = False) -> pd.DataFrame:
+        """
+        Фильтрует строки по диапазону дат (включительно).
+
+        Пустая граница (None или '') означает открытый диапазон.
+        """
+        return self.filter_by_date_ranges([(start, end)], copy=copy)[0]
+
+    def filter_by_date_ranges(self, ranges: Sequence[Tuple[Optional[str], Optional[str]]],
+                              copy: bool = False) -> List[pd.DataFrame]:
+        """
+        Фильтрует строки сразу по нескольким диапазонам дат.
+
+        Данные уже отсортированы по дате, поэтому границы всех диапазонов
+        находятся одним вызовом np.searchsorted по индексу (O(log n) на
+        диапазон), а результат — срез по позициям без полного прохода.
+
+        :param ranges: Пары (начальная дата, конечная дата).
+        :param copy: Вернуть копии вместо срезов общего DataFrame.
+        :return: Список DataFrame, по одному на диапазон.
+        """
+        if self.data is None or DATE_COLUMN not in self.data:
+            return [pd.DataFrame() for _ in ranges]
+
+        def bound(value: Optional[str]) -> np.datetime64:
+            if value is None or value == "":
+                return np.datetime64("NaT", "ns")
+            return pd.to_datetime(value).to_datetime64().astype("datetime64[ns]")
+
+        dates = self.data.index.to_numpy(dtype="datetime64[ns]")
+        starts = np.array([bound(start) for start, _ in ranges], dtype="datetime64[ns]")
+        ends = np.array([bound(end) for _, end in ranges], dtype="datetime64[ns]")
+        # Строки с NaT отсортированы в конец: открытый конец диапазона заканчивается перед ними
+        valid = np.searchsorted(dates, np.datetime64("NaT", "ns"), side="left")
+        lower = np.where(np.isnat(starts), 0, np.searchsorted(dates, starts, side="left"))
+        upper = np.where(np.isnat(ends), valid, np.searchsorted(dates, ends, side="right"))
+
+        results = []
+        for lo, hi in zip(lower, upper):
+            result = self.data.iloc[int(lo):int(max(lo, hi))]
+            results.append(result.copy() if copy else result)
+        return results
 
     def group_by_month(self, column: str) -> pd.Series:
         """Группирует данные по месяцам и вычисляет среднее значение."""
         if self.data is not None and DATE_COLUMN in self.data:
-            df = self.data.copy()
-            df[DATE_COLUMN] = pd.to_datetime(df[DATE_COLUMN], errors="coerce")
-            df["month"] = df[DATE_COLUMN].dt.to_period("M")
-            return df.groupby("month")[column].mean()
+            def compute() -> pd.Series:
+                months = self.data[DATE_COLUMN].dt.to_period("M").rename("month")
+                return self.data[column].groupby(months).mean()
+            return self._cached("group_by_month", column, compute)
         return pd.Series(dtype=float)
 
     def calculate_monthly_average(self, column: str) -> pd.Series:
@@ -89,15 +380,11 @@ class DataManager:
             print("Столбец 'дата' отсутствует.")
             return pd.Series(dtype=float)
 
-        try:
-            self.data['дата'] = pd.to_datetime(self.data['дата'], errors='coerce')
-        except Exception as e:
-            print(f"Ошибка преобразования столбца 'дата' в datetime: {e}")
-            return pd.Series(dtype=float)
-
         if self.data['дата'].isnull().all():
             print("Все значения в столбце 'дата' некорректны.")
             return pd.Series(dtype=float)
 
-        self.data['месяц'] = self.data['дата'].dt.to_period("M")
-        return self.data.groupby('месяц')[column].mean()
+        def compute() -> pd.Series:
+            months = self.data['дата'].dt.to_period("M").rename('месяц')
+            return self.data[column].groupby(months).mean()
+        return self._cached("monthly_average", column, compute)
@@ -1,5 +1,4 @@
 import sys
-import pandas as pd
 from PySide6.QtWidgets import QApplication, QMainWindow, QMessageBox, QFileDialog
 from ui_builder import UIBuilder
 from data_manager import DataManager
@@ -72,7 +71,7 @@ class Main(QMainWindow, UIBuilder):
             if filtered_data.empty:
                 QMessageBox.warning(self, "Результат", "Нет данных для указанного диапазона.")
             else:
-                QMessageBox.information(self, "Фильтрованные данные", str(filtered_data.head(10)))
+                QMessageBox.information(self, "Фильтрованные данные", str(self.data_manager.preview(filtered_data)))
         except Exception as e:
             self._show_error("Ошибка фильтрации", e)
 
@@ -84,7 +83,7 @@ class Main(QMainWindow, UIBuilder):
             if filtered_data.empty:
                 QMessageBox.warning(self, "Результат", "Нет данных с отклонением ≥ 0.5.")
             else:
-                QMessageBox.information(self, "Фильтрованные данные", str(filtered_data.head(10)))
+                QMessageBox.information(self, "Фильтрованные данные", str(self.data_manager.preview(filtered_data)))
         except Exception as e:
             self._show_error("Ошибка фильтрации", e)
 
@@ -102,7 +101,7 @@ class Main(QMainWindow, UIBuilder):
     def plot_histogram(self):
         """Построение гистограммы курса."""
         try:
-            data = self.data_manager.data.copy()
+            data = self.data_manager.data
             plot_histogram(
                 data=data, column="курс_usd",
                 title="Распределение курса USD", xlabel="Курс USD", ylabel="Частота"
@@ -141,7 +140,7 @@ class Main(QMainWindow, UIBuilder):
                 QMessageBox.warning(self, "Результат", "Нет данных для отображения отклонений.")
             else:
                 deviations = data_with_deviations[["median_dev", "mean_dev"]]
-                QMessageBox.information(self, "Отклонения", str(deviations.head(10)))
+                QMessageBox.information(self, "Отклонения", str(self.data_manager.preview(deviations)))
         except Exception as e:
             self._show_error("Ошибка отображения отклонений", e)
 
@@ -156,9 +155,7 @@ class Main(QMainWindow, UIBuilder):
                 QMessageBox.warning(self, "Результат", "Пожалуйста, введите месяц в формате YYYY-MM.")
                 raise ValueError("Пожалуйста, введите месяц в формате YYYY-MM.")
 
-            data = self.data_manager.data.copy()
-            data["дата"] = pd.to_datetime(data["дата"], errors="coerce")
-
+            data = self.data_manager.data
             monthly_data = data[data["дата"].dt.to_period("M") == month]
 
             if monthly_data.empty:
@@ -0,0 +1,92 @@
+import math
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence
+
+from quantile_sketch import DEFAULT_K, KLLSketch
+
+# Константы
+DESCRIBE_QUANTILES = [0.25, 0.5, 0.75]
+
+
+class RunningStats:
+    """
+    Онлайн-статистика числового ряда: количество, среднее и дисперсия
+    (алгоритм Уэлфорда), минимум, максимум и эскиз квантилей.
+
+    Добавление значений стоит O(m) по числу новых значений и не требует
+    исходных данных: при добавлении одного дня статистика обновляется
+    за O(1). Квантили приближенные (см. quantile_sketch.KLLSketch).
+    """
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.count = 0
+        self.mean = math.nan
+        self.min = math.nan
+        self.max = math.nan
+        self._m2 = 0.0  # Сумма квадратов отклонений от среднего
+        self.sketch = KLLSketch(k, seed=0)
+
+    def update(self, values) -> None:
+        """
+        Добавляет значения (NaN пропускаются).
+
+        Среднее и сумма квадратов отклонений новой порции объединяются
+        с накопленными по формуле Чана (обобщение Уэлфорда на порции),
+        что не теряет точность на больших рядах, в отличие от суммы квадратов.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        self._combine(values.size, batch_mean, batch_m2, float(values.min()), float(values.max()))
+        self.sketch.update(values)
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """Добавляет статистику другой части данных и возвращает self."""
+        if other.count:
+            self._combine(other.count, other.mean, other._m2, other.min, other.max)
+            self.sketch.merge(other.sketch)
+        return self
+
+    def _combine(self, count: int, mean: float, m2: float, minimum: float, maximum: float) -> None:
+        if self.count == 0:
+            self.count, self.mean, self._m2, self.min, self.max = count, mean, m2, minimum, maximum
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    @property
+    def variance(self) -> float:
+        """Выборочная дисперсия (ddof=1, как у pandas)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def describe(self, as_datetime: bool = False, quartiles: Optional[Sequence[float]] = None) -> pd.Series:
+        """
+        Возвращает статистику в формате DataFrame.describe.
+
+        :param as_datetime: Значения — даты в наносекундах; вернуть их как
+            Timestamp (стандартное отклонение для дат не выводится).
+        :param quartiles: Точные значения квантилей DESCRIBE_QUANTILES; по
+            умолчанию берутся приближенные из эскиза.
+        """
+        if quartiles is None:
+            quartiles = self.sketch.quantile(DESCRIBE_QUANTILES)
+        index = ['count', 'mean', 'std', 'min'] + [f"{q:.0%}" for q in DESCRIBE_QUANTILES] + ['max']
+        values = [self.count, self.mean, self.std, self.min, *quartiles, self.max]
+        if not as_datetime:
+            return pd.Series(values, index=index, dtype=float)
+        dates = [pd.NaT if math.isnan(value) else pd.Timestamp(int(round(value))) for value in values[1:]]
+        dates[1] = math.nan
+        return pd.Series([self.count, *dates], index=index, dtype=object)
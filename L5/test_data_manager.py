@@ -35,6 +35,105 @@ def test_clean_column(data_manager):
     assert cleaned_data["курс_usd"].dtype.kind in "fi", "Столбец не преобразован в числовой тип."
 
 
+def test_data_typed_once(data_manager):
+    """При присваивании данные типизируются, сортируются по дате и получают индекс дат."""
+    data_manager.data = pd.DataFrame({"дата": ["2023-01-02", "2023-01-01"], "курс_usd": ["72", "70"]})
+
+    assert isinstance(data_manager.data.index, pd.DatetimeIndex), "Индекс не является DatetimeIndex."
+    assert data_manager.data["дата"].is_monotonic_increasing, "Строки не отсортированы по дате."
+    assert data_manager.data["курс_usd"].dtype == "float64", "Курс не приведен к float64."
+
+
+def test_data_does_not_change_input(data_manager):
+    """Присваивание данных не меняет типы, порядок и индекс исходного DataFrame."""
+    df = pd.DataFrame({"дата": ["2023-01-02", "2023-01-01"], "курс_usd": ["72", "70"]})
+    expected = df.copy()
+    data_manager.data = df
+
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_load_csv_returns_copy(data_manager, tmp_path):
+    """Изменение загруженного DataFrame не затрагивает данные и кэш DataManager."""
+    (tmp_path / "dataset_v3.csv").write_text("дата;курс_usd\n2023-01-02;72\n2023-01-01;70", encoding="utf-8-sig")
+    df = data_manager.load_csv(str(tmp_path))
+    df["курс_usd"] = 0.0
+
+    assert data_manager.data["курс_usd"].tolist() == [70.0, 72.0], "Общие данные изменены через результат load_csv."
+
+
+def test_preview_newest_first(data_manager):
+    """В окне результатов сначала последние даты, дата выводится только столбцом."""
+    data_manager.data = pd.DataFrame({"дата": ["2023-01-03", "2023-01-01", "2023-01-02"], "курс_usd": [3, 1, 2]})
+    preview = data_manager.preview(data_manager.data, rows=2)
+
+    assert preview["курс_usd"].tolist() == [3.0, 2.0]
+    assert isinstance(preview.index, pd.RangeIndex), "Индекс дат не сброшен."
+
+
+def test_filter_copy_on_request(data_manager):
+    """Изменение копии результата фильтра не затрагивает исходные данные."""
+    data_manager.data = pd.DataFrame({"дата": ["2023-01-01", "2023-01-02"], "курс_usd": [70.0, 72.0]})
+    filtered = data_manager.filter_by_dates("2023-01-01", "2023-01-31", copy=True)
+    filtered["курс_usd"] = 0.0
+
+    assert data_manager.data["курс_usd"].tolist() == [70.0, 72.0], "Исходные данные изменились."
+
+
+def test_summary_cached_until_data_changes(data_manager):
+    """Повторный вызов возвращает запомненный результат, изменение данных его сбрасывает."""
+    data_manager.data = pd.DataFrame({"дата": ["2023-01-01", "2023-01-02"], "курс_usd": ["70", "bad"]})
+    summary = data_manager.get_summary()
+    assert data_manager.get_summary() is summary, "Статистика вычислена повторно."
+
+    data_manager.clean_column("курс_usd", inplace=True)
+    assert data_manager.get_summary() is not summary, "Кэш не сброшен после очистки столбца."
+    assert data_manager.group_by_month("курс_usd").loc["2023-01"] == 70.0
+
+
+def test_summary_updated_on_append(data_manager):
+    """После append статистика обновляется по новым строкам и совпадает с describe."""
+    data_manager.data = pd.DataFrame({"дата": ["2023-01-01", "2023-01-02"], "курс_usd": [70, 72]})
+    assert data_manager.get_summary().loc["mean", "курс_usd"] == 71
+
+    data_manager.append(pd.DataFrame({"дата": ["2023-01-03"], "курс_usd": [76]}))
+    summary = data_manager.get_summary()
+    expected = data_manager.data.describe()
+    for name in ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]:
+        assert summary.loc[name, "курс_usd"] == pytest.approx(expected.loc[name, "курс_usd"])
+    assert summary.loc["max", "дата"] == pd.Timestamp("2023-01-03")
+
+
+def test_summary_quartiles_exact_by_default(data_manager):
+    """Квартили по умолчанию точные, приближенные — только по запросу."""
+    data_manager.data = pd.DataFrame({
+        "дата": pd.date_range("2023-01-01", periods=1000, freq="D"),
+        "курс_usd": [70 + (i * 37 % 1000) / 100 for i in range(1000)],
+    })
+    expected = data_manager.data.describe()
+    summary = data_manager.get_summary()
+    for name in ["25%", "50%", "75%"]:
+        assert summary.loc[name, "курс_usd"] == expected.loc[name, "курс_usd"], f"Квартиль {name} не точный."
+        assert summary.loc[name, "дата"] == expected.loc[name, "дата"]
+
+    approximate = data_manager.get_summary(approximate=True)
+    assert approximate is not summary, "Точная и приближенная статистика запомнены под одним ключом."
+    assert approximate.loc["50%", "курс_usd"] == pytest.approx(expected.loc["50%", "курс_usd"], rel=0.01)
+
+
+def test_summary_updated_on_out_of_order_append(data_manager):
+    """Строки с более ранней датой дописываются с пересортировкой, статистика не теряется."""
+    data_manager.data = pd.DataFrame({"дата": ["2023-01-02", "2023-01-03"], "курс_usd": [72, 76]})
+    data_manager.get_summary()
+
+    data_manager.append(pd.DataFrame({"дата": ["2023-01-01"], "курс_usd": [70]}))
+    assert data_manager._stats["курс_usd"].count == 3, "Статистика потеряна при пересортировке."
+    summary = data_manager.get_summary()
+    expected = data_manager.data.describe()
+    for name in ["count", "mean", "std", "min", "max"]:
+        assert summary.loc[name, "курс_usd"] == pytest.approx(expected.loc[name, "курс_usd"])
+    assert summary.loc["min", "дата"] == pd.Timestamp("2023-01-01")
+
 def test_add_deviations(data_manager):
     """Проверка добавления отклонений от медианы и среднего."""
     data_manager.data = pd.DataFrame({"курс_usd": [70, 72, 75]})
@@ -44,6 +143,33 @@ def test_add_deviations(data_manager):
     assert "mean_dev" in deviations.columns, "Столбец 'mean_dev' отсутствует."
 
 
+def test_approximate_median(data_manager):
+    """Приближенная медиана совпадает с точной на малых данных и используется в отклонениях."""
+    data_manager.data = pd.DataFrame({"курс_usd": ["70", "invalid", "72", "75", "71"]})
+    cleaned = data_manager.clean_column("курс_usd", approximate=True)
+    assert cleaned["курс_usd"].tolist() == [70.0, 71.5, 72.0, 75.0, 71.0]
+
+    data_manager.clean_column("курс_usd", inplace=True)
+    deviations = data_manager.add_deviations("курс_usd", approximate=True)
+    assert deviations["median_dev"].tolist() == [-1.5, 0.0, 0.5, 3.5, -0.5]
+    quantiles = data_manager.get_quantiles("курс_usd", q=[0.5], approximate=True)
+    assert quantiles[0.5] == data_manager.get_quantiles("курс_usd", q=[0.5])[0.5]
+
+def test_rolling_append(data_manager):
+    """Скользящие показатели досчитываются при добавлении дня и совпадают с полным пересчетом."""
+    dates = pd.date_range("2023-01-01", periods=10).strftime("%Y-%m-%d")
+    rates = [70, 71, 73, 72, 74, 75, 73, 76, 77, 78]
+    data_manager.data = pd.DataFrame({"дата": dates[:9], "курс_usd": rates[:9]})
+    assert data_manager.rolling("курс_usd", 3)["rolling_mean"].iloc[-1] == pytest.approx((73 + 76 + 77) / 3)
+
+    data_manager.append(pd.DataFrame({"дата": [dates[9]], "курс_usd": [rates[9]]}))
+    result = data_manager.rolling("курс_usd", 3)
+    assert len(result) == 10 and result["rolling_max"].iloc[-1] == 78
+
+    expected = DataManager()
+    expected.data = pd.DataFrame({"дата": dates, "курс_usd": rates})
+    pd.testing.assert_frame_equal(result, expected.rolling("курс_usd", 3))
+
 def test_filter_by_deviation(data_manager):
     """Проверка фильтрации по отклонению."""
     data_manager.data = pd.DataFrame({"mean_dev": [0.5, 1.5, -0.2]})
@@ -61,6 +187,17 @@ def test_filter_by_dates(data_manager):
     assert len(filtered_data) == 2, "Фильтрация по диапазону дат выполнена неверно."
 
 
+def test_filter_by_date_ranges_open_ended(data_manager):
+    """Открытые границы и несколько диапазонов за один вызов."""
+    data_manager.data = pd.DataFrame({"дата": ["2023-02-01", "2023-01-01", "2023-01-02", "invalid"]})
+    before, after, everything = data_manager.filter_by_date_ranges(
+        [(None, "2023-01-01"), ("2023-01-02", ""), (None, None)]
+    )
+
+    assert len(before) == 1 and len(after) == 2, "Неверно обработаны открытые границы."
+    assert len(everything) == 3, "Строки с некорректной датой не должны попадать в результат."
+
+
 def test_group_by_month(data_manager):
     """Проверка группировки данных по месяцам."""
     data_manager.data = pd.DataFrame({"дата": ["2023-01-01", "2023-01-15", "2023-02-01"], "курс_usd": [70, 72, 75]})
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from quantile_sketch import KLLSketch, merge_sketches, sketch_of
+
+
+@pytest.fixture
+def values():
+    """Фикстура с перемешанными значениями, похожими на курс."""
+    return np.random.default_rng(1).normal(90, 3, 50_000)
+
+
+def test_small_sketch_is_exact():
+    """Пока эскиз не переполнен, квантили совпадают с точными."""
+    data = np.array([70.0, np.nan, 72.0, 75.0, 71.0])
+    sketch = sketch_of(data)
+    assert len(sketch) == 4, "NaN не должен учитываться."
+    assert sketch.median() == pytest.approx(np.nanmedian(data))
+    assert sketch.quantile([0, 1]).tolist() == [70.0, 75.0]
+
+
+def test_quantile_error_bounded(values):
+    """Ошибка ранга приближенных квантилей не превышает пары процентов, память ограничена."""
+    sketch = sketch_of(values)
+    levels = np.array([0.1, 0.25, 0.5, 0.75, 0.9])
+    ranks = np.searchsorted(np.sort(values), sketch.quantile(levels)) / len(values)
+    assert np.abs(ranks - levels).max() < 0.02
+    assert sum(level.size for level in sketch._levels) < 5 * sketch.k
+
+
+def test_merge_partitions(values):
+    """Объединение эскизов частей дает ту же точность, что и эскиз всех данных."""
+    parts = np.array_split(values, 5)
+    merged = merge_sketches(sketch_of(part) for part in parts)
+    assert len(merged) == len(values)
+    assert merged.min == values.min() and merged.max == values.max()
+    assert abs(np.mean(values <= merged.median()) - 0.5) < 0.02
+
+
+def test_empty_sketch():
+    """Пустой эскиз возвращает NaN."""
+    assert np.isnan(KLLSketch().median())
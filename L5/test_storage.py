@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+import pytest
+import storage
+from storage import columnar_path, load_dataset
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Фикстура с исходным CSV-файлом."""
+    file_path = tmp_path / "dataset_v3.csv"
+    file_path.write_text("Дата;Курс USD\n2024/10/05;94.87\n2024/10/04;95.0262\n", encoding="utf-8-sig")
+    return str(file_path)
+
+
+def test_load_dataset_types(csv_file):
+    """Дата читается как datetime64, курс — как float."""
+    df = load_dataset(csv_file)
+    assert pd.api.types.is_datetime64_any_dtype(df["Дата"]), "Дата не преобразована в datetime."
+    assert df["Курс USD"].dtype == float, "Курс должен быть числом."
+    assert os.path.exists(columnar_path(csv_file)), "Бинарная копия не создана."
+
+
+def test_load_dataset_uses_fresh_copy(csv_file, monkeypatch):
+    """При актуальной копии CSV повторно не читается."""
+    expected = load_dataset(csv_file)
+    monkeypatch.setattr(storage, "read_typed_csv", lambda _: pytest.fail("CSV не должен читаться повторно."))
+
+    pd.testing.assert_frame_equal(load_dataset(csv_file), expected)
+
+
+def test_load_dataset_detects_stale_copy(csv_file):
+    """После изменения CSV копия перестраивается."""
+    load_dataset(csv_file)
+    with open(csv_file, "a", encoding="utf-8") as file:
+        file.write("2024/10/03;94.5054\n")
+
+    df = load_dataset(csv_file)
+    assert len(df) == 3, "Изменения CSV не учтены."
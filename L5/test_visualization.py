@@ -1,7 +1,9 @@
 
+import matplotlib.pyplot as plt
+import numpy as np
 import pytest
 import pandas as pd
-from visualization import plot_graph, plot_histogram
+from visualization import decimate, plot_graph, plot_histogram
 
 # Позитивный сценарий
 def test_plot_graph_positive():
@@ -51,3 +53,35 @@ def test_plot_histogram_invalid_data():
     df = pd.DataFrame(data)
     with pytest.raises(ValueError):
         plot_histogram(df, "курс_usд", "Test Histogram", "USD Rate", "Frequency")
+
+# Вывод без экрана: байты PNG/SVG и файл, фигуры не остаются открытыми
+def test_plot_graph_offscreen(tmp_path):
+    df = pd.DataFrame({"дата": pd.to_datetime(["2023-01-01", "2023-01-02"]), "курс_usd": [70, 72]})
+    figures = plt.get_fignums()
+    png = plot_graph("дата", "курс_usd", df, "Test Plot", "Date", "USD Rate", output="png")
+    svg = plot_histogram(df, "курс_usd", "Test Histogram", "USD Rate", "Frequency", output="svg")
+    path = plot_graph("дата", "курс_usd", df, "Test Plot", "Date", "USD Rate", output=str(tmp_path / "plot.png"))
+
+    assert png.startswith(b"\x89PNG")
+    assert b"<svg" in svg
+    assert path == str(tmp_path / "plot.png") and (tmp_path / "plot.png").stat().st_size > 0
+    assert plt.get_fignums() == figures, "Фигуры не были освобождены."
+
+# Прореживание длинных рядов: размер ограничен, экстремумы и концы сохраняются
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_decimate_long_series(method):
+    values = np.cumsum(np.random.default_rng(4).normal(size=100_000))
+    df = pd.DataFrame({"дата": pd.date_range("2000-01-01", periods=len(values), freq="h"), "курс_usd": values})
+    result = decimate(df, "дата", "курс_usd", 1000, method)
+
+    assert len(result) <= 1002
+    assert result["дата"].iloc[0] == df["дата"].iloc[0] and result["дата"].iloc[-1] == df["дата"].iloc[-1]
+    assert result["дата"].is_monotonic_increasing
+    if method == "minmax":
+        assert result["курс_usd"].max() == values.max() and result["курс_usd"].min() == values.min()
+
+# Негативный сценарий: неизвестный метод прореживания
+def test_decimate_unknown_method():
+    df = pd.DataFrame({"дата": range(10), "курс_usd": range(10)})
+    with pytest.raises(ValueError):
+        decimate(df, "дата", "курс_usd", 5, "median")
@@ -1,10 +1,162 @@
+import io
+import os
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from typing import List, Optional, Union
+
+# Константы
+IMAGE_FORMATS = ("png", "svg")
+DECIMATION_METHODS = ("minmax", "lttb")
+POINTS_PER_PIXEL = 2  # Точек линии на столбец пикселей после прореживания
+
+Output = Optional[Union[str, os.PathLike]]
+
+
+def _new_figure(figsize, output: Output) -> Figure:
+    """
+    Создает фигуру: для показа на экране — через pyplot, для вывода в
+    файл или байты — отдельную Figure с холстом Agg без глобального
+    состояния pyplot (работает без дисплея и не накапливает фигуры).
+    """
+    if output is None:
+        return plt.figure(figsize=figsize)
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _release(figure: Figure, output: Output) -> None:
+    if output is None:
+        plt.close(figure)
+    else:
+        figure.clear()
+
+
+def _render(figure: Figure, output: Output) -> Optional[Union[bytes, str]]:
+    """
+    Показывает фигуру или сохраняет ее и освобождает.
+
+    :param output: None — показать окно; 'png' или 'svg' — вернуть
+        изображение байтами; путь к файлу — сохранить (формат по расширению).
+    :return: Байты изображения, путь к файлу или None.
+    """
+    if output is None:
+        plt.show()
+        return None
+    try:
+        if isinstance(output, str) and output.lower() in IMAGE_FORMATS:
+            buffer = io.BytesIO()
+            figure.savefig(buffer, format=output.lower())
+            return buffer.getvalue()
+        figure.savefig(output)
+        return os.fspath(output)
+    finally:
+        _release(figure, output)
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Прореживание огибающей минимумов и максимумов.
+
+    Ряд делится на max_points // 2 равных корзин, и из каждой берутся
+    позиции минимума и максимума, поэтому все пики и провалы сохраняются.
+    Работает за O(n) без цикла по корзинам.
+
+    :param y: Значения ряда (NaN допускаются).
+    :param max_points: Максимальное число точек результата.
+    :return: Отсортированные позиции выбранных точек.
+    """
+    n = y.size
+    buckets = max(max_points // 2, 1)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    lows = offsets + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    indices = np.concatenate([[0, n - 1], lows, highs])
+    return np.unique(indices[indices < n])
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Прореживание алгоритмом Largest-Triangle-Three-Buckets.
+
+    Первая и последняя точки сохраняются; из каждой промежуточной корзины
+    берется точка, образующая треугольник наибольшей площади с уже
+    выбранной точкой и средним следующей корзины. Форма линии при этом
+    визуально сохраняется.
+
+    :param x: Координаты X (числа).
+    :param y: Значения ряда.
+    :param max_points: Число точек результата (не меньше 3).
+    :return: Позиции выбранных точек.
+    """
+    n = y.size
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    y = np.where(np.isnan(y), np.nanmean(y), y)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < edges.size else n
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def decimate(data: pd.DataFrame, x: str, y: Union[str, List[str]], max_points: int,
+             method: str = "minmax") -> pd.DataFrame:
+    """
+    Сокращает число строк для построения линии примерно до ширины графика в пикселях.
+
+    :param data: DataFrame, отсортированный по x.
+    :param x: Столбец оси X.
+    :param y: Столбец или список столбцов оси Y (точки объединяются по всем).
+    :param max_points: Желаемое число точек на столбец.
+    :param method: 'minmax' (огибающая, сохраняет все экстремумы) или 'lttb'.
+    :return: Выборка строк data (или data, если строк и так немного).
+    """
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f"Неизвестный метод прореживания: {method}")
+    if len(data) <= max_points:
+        return data
+
+    if method == "lttb":
+        values = data[x]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            coordinates = values.to_numpy(dtype="datetime64[ns]").astype("int64").astype("float64")
+        elif pd.api.types.is_numeric_dtype(values):
+            coordinates = values.to_numpy(dtype="float64")
+        else:
+            coordinates = np.arange(len(data), dtype="float64")
+
+    indices = []
+    for column in ([y] if isinstance(y, str) else list(y)):
+        values = pd.to_numeric(data[column], errors="coerce").to_numpy(dtype="float64")
+        if method == "minmax":
+            indices.append(minmax_indices(values, max_points))
+        else:
+            indices.append(lttb_indices(coordinates, values, max_points))
+    positions = np.unique(np.concatenate(indices))
+    return data.iloc[positions]
+
 
 def plot_graph(
     x: str, y: str, data: pd.DataFrame, title: str,
-    xlabel: str, ylabel: str, kind: str = "line", **kwargs
-) -> None:
+    xlabel: str, ylabel: str, kind: str = "line",
+    output: Output = None, **kwargs
+) -> Optional[Union[bytes, str]]:
     """
     Построение графиков.
 
@@ -15,38 +167,54 @@ def plot_graph(
     :param xlabel: Метка оси X.
     :param ylabel: Метка оси Y.
     :param kind: Тип графика ('line', 'bar', 'scatter').
+    :param output: None — показать окно; 'png' или 'svg' — вернуть байты
+        изображения; путь к файлу — сохранить в него.
     :param kwargs: Дополнительные параметры для настройки графика.
+        Для линий: decimate — метод прореживания ('minmax' по умолчанию,
+        'lttb' или None, чтобы рисовать все точки); max_points — число
+        точек после прореживания (по умолчанию — две на пиксель ширины).
+    :return: Байты изображения или путь к файлу при выводе без экрана.
     """
-    plt.figure(figsize=kwargs.get("figsize", (10, 6)))
-
-    if kind == "line":
-        plt.plot(data[x], data[y], label=kwargs.get("label", y),
-                 linestyle=kwargs.get("linestyle", "-"))
-    elif kind == "bar":
-        plt.bar(data[x], data[y], label=kwargs.get("label", y))
-    elif kind == "scatter":
-        plt.scatter(data[x], data[y], label=kwargs.get("label", y))
-    else:
-        print(f"Unsupported plot kind: {kind}")
-        return
+    figure = _new_figure(kwargs.get("figsize", (10, 6)), output)
+    try:
+        ax = figure.add_subplot()
+        if kind == "line":
+            method = kwargs.get("decimate", "minmax")
+            if method is not None:
+                width = figure.get_figwidth() * figure.dpi
+                data = decimate(data, x, y, kwargs.get("max_points") or int(width * POINTS_PER_PIXEL), method)
+            ax.plot(data[x], data[y], label=kwargs.get("label", y),
+                    linestyle=kwargs.get("linestyle", "-"))
+        elif kind == "bar":
+            ax.bar(data[x], data[y], label=kwargs.get("label", y))
+        elif kind == "scatter":
+            ax.scatter(data[x], data[y], label=kwargs.get("label", y))
+        else:
+            print(f"Unsupported plot kind: {kind}")
+            _release(figure, output)
+            return None
 
-    if "mean" in kwargs:
-        plt.axhline(kwargs["mean"], color='red', linestyle='--', label="Среднее")
-    if "median" in kwargs:
-        plt.axhline(kwargs["median"], color='green', linestyle='--', label="Медиана")
+        if "mean" in kwargs:
+            ax.axhline(kwargs["mean"], color='red', linestyle='--', label="Среднее")
+        if "median" in kwargs:
+            ax.axhline(kwargs["median"], color='green', linestyle='--', label="Медиана")
 
-    plt.title(title)
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.legend()
+        ax.grid(True)
+    except Exception:
+        _release(figure, output)
+        raise
+    return _render(figure, output)
 
 
 def plot_histogram(
     data: pd.DataFrame, column: str, title: str,
-    xlabel: str, ylabel: str, bins: int = 30
-) -> None:
+    xlabel: str, ylabel: str, bins: int = 30,
+    output: Output = None
+) -> Optional[Union[bytes, str]]:
     """
     Построение гистограммы.
 
@@ -56,11 +224,19 @@ def plot_histogram(
     :param xlabel: Метка оси X.
     :param ylabel: Метка оси Y.
     :param bins: Количество бинов.
+    :param output: None — показать окно; 'png' или 'svg' — вернуть байты
+        изображения; путь к файлу — сохранить в него.
+    :return: Байты изображения или путь к файлу при выводе без экрана.
     """
-    plt.figure(figsize=(8, 6))
-    plt.hist(data[column], bins=bins, color="blue", edgecolor="black")
-    plt.title(title)
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-    plt.grid(True)
-    plt.show()
+    figure = _new_figure((8, 6), output)
+    try:
+        ax = figure.add_subplot()
+        ax.hist(data[column], bins=bins, color="blue", edgecolor="black")
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.grid(True)
+    except Exception:
+        _release(figure, output)
+        raise
+    return _render(figure, output)
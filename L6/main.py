@@ -1,18 +1,19 @@
 import sys
-import pandas as pd
 from PySide6.QtWidgets import QApplication, QMainWindow, QMessageBox, QFileDialog
 from ui_builder import UIBuilder
 from data_manager import DataManager
-from visualization import plot_graph, plot_histogram
+from task_runner import TaskRunner
 
 
 class Main(QMainWindow, UIBuilder):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("USD Analysis Tool")
-        self.resize(800, 600)
+        self.resize(900, 1000)
         self.data_manager = DataManager()
         self.dataset_folder = None
+        self.task_runner = TaskRunner()
+        self.current_task = None
 
         self.setup_ui(self)
         self._connect_signals()
@@ -30,28 +31,71 @@ class Main(QMainWindow, UIBuilder):
             self.show_deviations_button: self.show_deviations,
             self.plot_month_graph_button: self.plot_month_graph,
             self.classification_forecasting_button: self.classification_forecasting,
+            self.cancel_task_button: self.cancel_task,
         }
 
         for button, method in signals.items():
             button.clicked.connect(method)
 
+    def _run_task(self, error_title, func, on_result, *args, with_hooks=False, **kwargs):
+        """
+        Выполняет операцию с данными в фоновом потоке, не блокируя окно.
+
+        На время выполнения кнопки действий отключаются: DataManager не
+        рассчитан на одновременные операции.
+
+        :param error_title: Заголовок сообщения об ошибке.
+        :param func: Функция, выполняемая в фоновом потоке.
+        :param on_result: Вызывается в потоке интерфейса с результатом func.
+        :param with_hooks: Передавать ли в func progress и should_stop.
+        """
+        self._set_busy(True)
+        self.current_task = self.task_runner.submit(
+            func, *args,
+            on_result=on_result,
+            on_error=lambda e: self._show_error(error_title, e),
+            on_progress=self.task_progress_bar.setValue,
+            on_cancelled=lambda: QMessageBox.information(self, "Отмена", "Операция отменена."),
+            on_finished=lambda: self._set_busy(False),
+            with_hooks=with_hooks, **kwargs
+        )
+
+    def cancel_task(self):
+        """Отмена выполняющейся операции."""
+        if self.current_task is not None:
+            self.current_task.cancel()
+            self.cancel_task_button.setEnabled(False)
+
+    def _set_busy(self, busy: bool):
+        """Переключает окно между состояниями «выполняется операция» и «готово»."""
+        if not busy:
+            self.current_task = None
+        self.task_progress_bar.setRange(0, 100)
+        self.task_progress_bar.setValue(0)
+        self.cancel_task_button.setEnabled(busy)
+        self.select_folder_button.setEnabled(not busy)
+        if self.data_manager.data is not None:
+            self._set_action_buttons_enabled(not busy)
+
+    def _show_error(self, title: str, error: Exception):
+        """Показывает сообщение об ошибке."""
+        QMessageBox.critical(self, title, str(error))
+
     def select_folder(self):
         """Выбор папки с датасетом."""
         folder = QFileDialog.getExistingDirectory(self, "Выберите папку с датасетом")
         if folder:
             self.dataset_folder = folder
-            try:
-                self.data_manager.load_csv(folder)
-                self._enable_action_buttons()
-                QMessageBox.information(self, "Успех", "Данные успешно загружены!")
-            except FileNotFoundError as e:
-                QMessageBox.critical(self, "Ошибка", str(e))
+            self._run_task("Ошибка", self.data_manager.load_csv, self._on_data_loaded, folder)
         else:
             QMessageBox.warning(self, "Ошибка", "Папка не выбрана!")
 
-    def _enable_action_buttons(self):
-        """Активирует кнопки действий после загрузки данных."""
-        buttons = [
+    def _on_data_loaded(self, _data):
+        self._enable_action_buttons()
+        QMessageBox.information(self, "Успех", "Данные успешно загружены!")
+
+    def _action_buttons(self):
+        return [
             self.filter_date_button,
             self.filter_deviation_button,
             self.plot_graph_button,
@@ -62,133 +106,156 @@ class Main(QMainWindow, UIBuilder):
             self.plot_month_graph_button,
             self.classification_forecasting_button,
         ]
-        for button in buttons:
-            button.setEnabled(True)
+
+    def _set_action_buttons_enabled(self, enabled: bool):
+        for button in self._action_buttons():
+            button.setEnabled(enabled)
+
+    def _enable_action_buttons(self):
+        """Активирует кнопки действий после загрузки данных."""
+        self._set_action_buttons_enabled(True)
 
     def filter_by_date(self):
         """Фильтрация данных по диапазону дат."""
         start_date = self.start_date_input.text()
         end_date = self.end_date_input.text()
-        try:
-            filtered_data = self.data_manager.filter_by_dates(start_date, end_date)
+
+        def show(filtered_data):
             if filtered_data.empty:
                 QMessageBox.warning(self, "Результат", "Нет данных для указанного диапазона.")
             else:
-                QMessageBox.information(self, "Фильтрованные данные", str(filtered_data.head(10)))
-        except Exception as e:
-            self._show_error("Ошибка фильтрации", e)
+                self.plot_canvas.plot_line(
+                    filtered_data, x="дата", y="курс_usd",
+                    title=f"Курс USD: {start_date or '...'} — {end_date or '...'}", xlabel="Дата", ylabel="Курс USD"
+                )
+                QMessageBox.information(self, "Фильтрованные данные", str(self.data_manager.preview(filtered_data)))
+
+        self._run_task("Ошибка фильтрации", self.data_manager.filter_by_dates, show, start_date, end_date)
 
     def filter_by_deviation(self):
         """Фильтрация данных по отклонениям."""
-        try:
-            threshold = 0.5  # Порог отклонения
-            filtered_data = self.data_manager.filter_by_deviation(threshold)
+        threshold = 0.5  # Порог отклонения
+
+        def show(filtered_data):
             if filtered_data.empty:
                 QMessageBox.warning(self, "Результат", "Нет данных с отклонением ≥ 0.5.")
             else:
-                QMessageBox.information(self, "Фильтрованные данные", str(filtered_data.head(10)))
-        except Exception as e:
-            self._show_error("Ошибка фильтрации", e)
+                QMessageBox.information(self, "Фильтрованные данные", str(self.data_manager.preview(filtered_data)))
+
+        self._run_task("Ошибка фильтрации", self.data_manager.filter_by_deviation, show, threshold)
 
     def plot_graph(self):
         """Построение графика изменения курса."""
-        try:
-            df = self.data_manager.calculate_monthly_average('курс_usd')
-            plot_graph(
-                x="дата", y="курс_usd", data=self.data_manager.data,
+        def prepare():
+            self.data_manager.calculate_monthly_average('курс_usd')
+            return self.data_manager.data
+
+        def show(data):
+            # Холст графика обновляется только в потоке интерфейса
+            self.plot_canvas.plot_line(
+                data, x="дата", y="курс_usd",
                 title="Изменение курса USD", xlabel="Дата", ylabel="Курс USD"
             )
-        except Exception as e:
-            self._show_error("Ошибка построения графика", e)
+
+        self._run_task("Ошибка построения графика", prepare, show)
 
     def plot_histogram(self):
         """Построение гистограммы курса."""
-        try:
-            data = self.data_manager.data.copy()
-            plot_histogram(
-                data=data, column="курс_usd",
+        def show(data):
+            self.plot_canvas.plot_histogram(
+                data, column="курс_usd",
                 title="Распределение курса USD", xlabel="Курс USD", ylabel="Частота"
             )
-        except Exception as e:
-            self._show_error("Ошибка построения гистограммы", e)
+
+        self._run_task("Ошибка построения гистограммы", lambda: self.data_manager.data, show)
 
     def calculate_monthly_avg(self):
         """Расчет средних значений по месяцам."""
-        try:
-            avg_data = self.data_manager.group_by_month("курс_usd")
+        def show(avg_data):
             QMessageBox.information(self, "Средние значения по месяцам", str(avg_data))
-        except Exception as e:
-            self._show_error("Ошибка расчета", e)
+
+        self._run_task("Ошибка расчета", self.data_manager.group_by_month, show, "курс_usd")
 
     def show_statistics(self):
         """Отображение общей статистики."""
-        try:
-            stats = self.data_manager.get_summary()
+        def show(stats):
             if stats.empty:
                 QMessageBox.warning(self, "Статистика", "Нет данных для отображения.")
             else:
                 QMessageBox.information(self, "Статистика", str(stats))
-        except Exception as e:
-            self._show_error("Ошибка отображения статистики", e)
+
+        self._run_task("Ошибка отображения статистики", self.data_manager.get_summary, show)
 
     def show_deviations(self):
         """Показ отклонений от медианы и среднего."""
-        try:
-            if self.data_manager.data is None:
-                raise ValueError("Данные не загружены. Пожалуйста, выберите папку с датасетом.")
-
-            data_with_deviations = self.data_manager.add_deviations("курс_usd")
+        if self.data_manager.data is None:
+            self._show_error("Ошибка отображения отклонений",
+                             ValueError("Данные не загружены. Пожалуйста, выберите папку с датасетом."))
+            return
 
+        def show(data_with_deviations):
             if data_with_deviations.empty:
                 QMessageBox.warning(self, "Результат", "Нет данных для отображения отклонений.")
             else:
                 deviations = data_with_deviations[["median_dev", "mean_dev"]]
-                QMessageBox.information(self, "Отклонения", str(deviations.head(10)))
-        except Exception as e:
-            self._show_error("Ошибка отображения отклонений", e)
+                QMessageBox.information(self, "Отклонения", str(self.data_manager.preview(deviations)))
+
+        self._run_task("Ошибка отображения отклонений", self.data_manager.add_deviations, show, "курс_usd")
 
     def plot_month_graph(self):
         """Построение графика за указанный месяц."""
-        try:
-            if self.data_manager.data is None:
-                raise ValueError("Данные не загружены. Пожалуйста, выберите папку с датасетом.")
+        if self.data_manager.data is None:
+            self._show_error("Ошибка построения графика за месяц",
+                             ValueError("Данные не загружены. Пожалуйста, выберите папку с датасетом."))
+            return
 
-            month = self.month_input.text()
-            if not month:
-                QMessageBox.warning(self, "Результат", "Пожалуйста, введите месяц в формате YYYY-MM.")
-                raise ValueError("Пожалуйста, введите месяц в формате YYYY-MM.")
+        month = self.month_input.text()
+        if not month:
+            QMessageBox.warning(self, "Результат", "Пожалуйста, введите месяц в формате YYYY-MM.")
+            return
 
-            data = self.data_manager.data.copy()
-            data["дата"] = pd.to_datetime(data["дата"], errors="coerce")
-
-            monthly_data = data[data["дата"].dt.to_period("M") == month]
+        def prepare():
+            data = self.data_manager.data
+            return data[data["дата"].dt.to_period("M") == month]
 
+        def show(monthly_data):
             if monthly_data.empty:
                 QMessageBox.warning(self, "Внимание", f"Данных за месяц {month} не найдено.")
                 return
 
-            plot_graph(
+            self.plot_canvas.plot_line(
+                monthly_data,
                 x="дата",
                 y="курс_usd",
-                data=monthly_data,
                 title=f"Курс USD за {month}",
                 xlabel="Дата",
                 ylabel="Курс USD",
                 mean=monthly_data["курс_usd"].mean(),
                 median=monthly_data["курс_usd"].median()
             )
-        except Exception as e:
-            self._show_error("Ошибка построения графика за месяц", e)
+
+        self._run_task("Ошибка построения графика за месяц", prepare, show)
 
     def classification_forecasting(self):
         """Классификация и прогнозирование"""
-        try:
-            if self.data_manager.data is None:
-                raise ValueError("Данные не загружены. Пожалуйста, выберите папку с датасетом.")
-            stats = self.data_manager.get_classification_forecasting()
+        if self.data_manager.data is None:
+            self._show_error("Ошибка классификации и пронозирования",
+                             ValueError("Данные не загружены. Пожалуйста, выберите папку с датасетом."))
+            return
+
+        def show(stats):
             QMessageBox.information(self, "Статистика", str(stats))
-        except Exception as e:
-            self._show_error("Ошибка классификации и пронозирования", e)
+
+        self._run_task(
+            "Ошибка классификации и пронозирования",
+            self.data_manager.get_classification_forecasting, show, with_hooks=True
+        )
+
+    def closeEvent(self, event):
+        """Отменяет фоновые операции и дожидается их завершения при закрытии окна."""
+        self.task_runner.cancel_all()
+        self.task_runner.wait()
+        super().closeEvent(event)
 
 def main():
     """Точка входа в приложение."""
@@ -0,0 +1,169 @@
+import math
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.dates import AutoDateLocator, ConciseDateFormatter, date2num
+from matplotlib.figure import Figure
+from matplotlib.ticker import AutoLocator, ScalarFormatter
+from typing import Optional
+
+from visualization import POINTS_PER_PIXEL, decimate
+
+# Константы
+FIGURE_SIZE = (8, 3.5)
+HISTOGRAM_BINS = 30
+MARGIN = 0.05  # Доля диапазона, добавляемая к пределам осей
+# Фиксированные поля вместо автоматической компоновки, которая пересчитывается при каждой перерисовке
+SUBPLOT_MARGINS = dict(left=0.09, right=0.98, bottom=0.14, top=0.9)
+
+
+class PlotCanvas(FigureCanvasQTAgg):
+    """
+    Встроенный в окно график matplotlib.
+
+    Линия курса, линии среднего и медианы и столбцы гистограммы создаются
+    один раз и затем только обновляются (set_data, set_height). Линии
+    анимированные: если пределы осей и подписи не изменились, новый кадр
+    получается блиттингом — фон восстанавливается из сохраненной копии,
+    и перерисовываются только линии. Иначе выполняется одна полная
+    перерисовка холста. Новые фигуры и окна не создаются.
+    """
+
+    def __init__(self, parent=None):
+        figure = Figure(figsize=FIGURE_SIZE)
+        figure.subplots_adjust(**SUBPLOT_MARGINS)
+        super().__init__(figure)
+        self.setParent(parent)
+        self.axes = figure.add_subplot()
+        self.axes.grid(True)
+
+        (self.line,) = self.axes.plot([], [], label="Курс USD", animated=True)
+        self.mean_line = self.axes.axhline(math.nan, color="red", linestyle="--", label="Среднее", animated=True)
+        self.median_line = self.axes.axhline(math.nan, color="green", linestyle="--", label="Медиана", animated=True)
+        self.bars = self.axes.bar(np.zeros(HISTOGRAM_BINS), np.zeros(HISTOGRAM_BINS),
+                                  color="blue", edgecolor="black", align="edge")
+        self._set_bars_visible(False)
+
+        self._mode = None
+        self._background = None
+        self.mpl_connect("draw_event", self._on_draw)
+
+    def _animated_artists(self):
+        return [self.line, self.mean_line, self.median_line]
+
+    def _on_draw(self, _event) -> None:
+        """После полной перерисовки сохраняет фон и дорисовывает анимированные линии."""
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        for artist in self._animated_artists():
+            if artist.get_visible():
+                self.axes.draw_artist(artist)
+
+    def _set_bars_visible(self, visible: bool) -> None:
+        for bar in self.bars:
+            bar.set_visible(visible)
+
+    def _set_labels(self, title: str, xlabel: str, ylabel: str) -> bool:
+        """Обновляет подписи; возвращает True, если они изменились."""
+        changed = (self.axes.get_title(), self.axes.get_xlabel(), self.axes.get_ylabel()) != (title, xlabel, ylabel)
+        if changed:
+            self.axes.set_title(title)
+            self.axes.set_xlabel(xlabel)
+            self.axes.set_ylabel(ylabel)
+        return changed
+
+    def _set_limits(self, xmin: float, xmax: float, ymin: float, ymax: float) -> bool:
+        """Устанавливает пределы осей с отступами; возвращает True, если они изменились."""
+        def padded(low, high):
+            pad = (high - low) * MARGIN or abs(low) * MARGIN or 1.0
+            return low - pad, high + pad
+
+        xlim, ylim = padded(xmin, xmax), padded(ymin, ymax)
+        changed = not (np.allclose(self.axes.get_xlim(), xlim) and np.allclose(self.axes.get_ylim(), ylim))
+        if changed:
+            self.axes.set_xlim(xlim)
+            self.axes.set_ylim(ylim)
+        return changed
+
+    def _blit(self) -> None:
+        """Перерисовывает только анимированные линии поверх сохраненного фона."""
+        self.restore_region(self._background)
+        for artist in self._animated_artists():
+            if artist.get_visible():
+                self.axes.draw_artist(artist)
+        self.blit(self.figure.bbox)
+
+    def plot_line(self, data: pd.DataFrame, x: str, y: str, title: str, xlabel: str, ylabel: str,
+                  mean: Optional[float] = None, median: Optional[float] = None) -> bool:
+        """
+        Показывает линию y(x), при необходимости с линиями среднего и медианы.
+
+        Длинный ряд прореживается до ширины холста (см. visualization.decimate).
+
+        :return: True, если кадр обновлен блиттингом без полной перерисовки.
+        """
+        width = max(self.width(), 1) * self.devicePixelRatioF()
+        data = decimate(data, x, y, int(width * POINTS_PER_PIXEL))
+        xs, ys = data[x], data[y].to_numpy(dtype="float64")
+        is_date = pd.api.types.is_datetime64_any_dtype(xs)
+        xs = date2num(xs.to_numpy()) if is_date else xs.to_numpy(dtype="float64")
+
+        self.line.set_data(xs, ys)
+        self.line.set_visible(True)
+        for artist, value in ((self.mean_line, mean), (self.median_line, median)):
+            artist.set_visible(value is not None)
+            artist.set_ydata([value, value] if value is not None else [math.nan, math.nan])
+
+        full_redraw = self._mode != ("line", is_date) or self._background is None
+        if self._mode != ("line", is_date):
+            self._set_bars_visible(False)
+            self._set_date_axis(is_date)
+            self._mode = ("line", is_date)
+        levels = [value for value in (mean, median) if value is not None]
+        finite = ys[np.isfinite(ys)]
+        if xs.size and finite.size:
+            full_redraw |= self._set_limits(np.nanmin(xs), np.nanmax(xs),
+                                            min([finite.min(), *levels]), max([finite.max(), *levels]))
+        full_redraw |= self._set_labels(title, xlabel, ylabel)
+
+        if full_redraw:
+            # Фиксированное положение: подбор 'best' проверяет пересечения со всеми точками при каждой отрисовке
+            self.axes.legend(handles=[artist for artist in self._animated_artists() if artist.get_visible()],
+                             loc="upper left")
+            self.draw_idle()
+            return False
+        self._blit()
+        return True
+
+    def _set_date_axis(self, is_date: bool) -> None:
+        if is_date:
+            locator = AutoDateLocator()
+            self.axes.xaxis.set_major_locator(locator)
+            self.axes.xaxis.set_major_formatter(ConciseDateFormatter(locator))
+        else:
+            self.axes.xaxis.set_major_locator(AutoLocator())
+            self.axes.xaxis.set_major_formatter(ScalarFormatter())
+
+    def plot_histogram(self, data: pd.DataFrame, column: str, title: str, xlabel: str, ylabel: str) -> None:
+        """Показывает гистограмму столбца, обновляя существующие столбцы."""
+        values = pd.to_numeric(data[column], errors="coerce").dropna().to_numpy(dtype="float64")
+        counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+        for bar, count, left, right in zip(self.bars, counts, edges[:-1], edges[1:]):
+            bar.set_x(left)
+            bar.set_width(right - left)
+            bar.set_height(count)
+
+        if self._mode != "histogram":
+            self.line.set_data([], [])
+            for artist in self._animated_artists():
+                artist.set_visible(False)
+            self._set_bars_visible(True)
+            self._set_date_axis(False)
+            self._mode = "histogram"
+        if values.size:
+            self.axes.set_xlim(edges[0], edges[-1])
+            self.axes.set_ylim(0, max(counts.max(), 1) * (1 + MARGIN))
+        self._set_labels(title, xlabel, ylabel)
+        legend = self.axes.get_legend()
+        if legend is not None:
+            legend.remove()
+        self.draw_idle()
@@ -0,0 +1,158 @@
+import math
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+# Константы
+ROLLING_COLUMNS = ["rolling_mean", "rolling_std", "rolling_min", "rolling_max", "zscore", "ewma"]
+
+
+def _window_sums(values: np.ndarray, window: int):
+    """
+    Суммы, суммы квадратов и количество непустых значений в каждом окне.
+
+    Считаются разностью кумулятивных сумм: O(n) независимо от размера окна.
+    Значения центрируются по первому непустому значению, чтобы разность
+    больших сумм квадратов не теряла точность.
+    """
+    valid = ~np.isnan(values)
+    reference = values[valid][0] if valid.any() else 0.0
+    centered = np.where(valid, values - reference, 0.0)
+
+    def window_total(x: np.ndarray) -> np.ndarray:
+        cumulative = np.concatenate([[0.0], np.cumsum(x)])
+        end = np.arange(1, values.size + 1)
+        return cumulative[end] - cumulative[np.maximum(end - window, 0)]
+
+    return window_total(centered), window_total(centered ** 2), window_total(valid.astype(np.float64)), reference
+
+
+def rolling_mean(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Скользящее среднее по окну из window последних значений (как Series.rolling(window).mean()).
+
+    :param values: Массив значений (NaN — пропуск).
+    :param window: Размер окна.
+    :param min_periods: Минимум непустых значений в окне (по умолчанию — window).
+    :return: Массив той же длины; NaN, где значений в окне недостаточно.
+    """
+    sums, _, counts, reference = _window_sums(values, window)
+    enough = counts >= (window if min_periods is None else max(min_periods, 1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(enough, sums / counts + reference, np.nan)
+
+
+def rolling_std(values: np.ndarray, window: int, min_periods: Optional[int] = None, ddof: int = 1) -> np.ndarray:
+    """Скользящее стандартное отклонение (по умолчанию выборочное, ddof=1, как у pandas)."""
+    sums, squares, counts, _ = _window_sums(values, window)
+    enough = (counts >= (window if min_periods is None else max(min_periods, 1))) & (counts > ddof)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (squares - sums ** 2 / counts) / (counts - ddof)
+    return np.where(enough, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+
+def _rolling_extreme(values: np.ndarray, window: int, min_periods: Optional[int],
+                     func: np.ufunc, empty: float) -> np.ndarray:
+    """
+    Скользящий минимум или максимум алгоритмом ван Херка — Гил-Вермана.
+
+    Массив делится на блоки длины window; внутри блоков считаются
+    накопленные экстремумы слева направо и справа налево. Любое окно
+    покрывает конец одного блока и начало следующего, поэтому его
+    экстремум — func от двух готовых значений: O(n) без цикла по окну.
+    """
+    n = values.size
+    if n == 0:
+        return np.empty(0)
+    filled = np.where(np.isnan(values), empty, values)
+    blocks = np.concatenate([filled, np.full(-n % window, empty)]).reshape(-1, window)
+    prefix = func.accumulate(blocks, axis=1).ravel()[:n]
+    suffix = func.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()[:n]
+
+    end = np.arange(n)
+    start = end - window + 1
+    result = np.where(start >= 0, func(suffix[np.maximum(start, 0)], prefix), prefix)
+    _, _, counts, _ = _window_sums(values, window)
+    return np.where(counts >= (window if min_periods is None else max(min_periods, 1)), result, np.nan)
+
+
+def rolling_min(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    return _rolling_extreme(values, window, min_periods, np.minimum, np.inf)
+
+
+def rolling_max(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    return _rolling_extreme(values, window, min_periods, np.maximum, -np.inf)
+
+
+def ewma(values: np.ndarray, alpha: float, initial: float = math.nan) -> np.ndarray:
+    """
+    Экспоненциальное скользящее среднее: y[t] = alpha * x[t] + (1 - alpha) * y[t-1].
+
+    Пропуски не меняют среднее (как ewm(adjust=False, ignore_na=True)).
+
+    :param values: Массив значений.
+    :param alpha: Коэффициент сглаживания от 0 до 1.
+    :param initial: Значение среднего перед первым элементом (для продолжения ряда).
+    :return: Массив той же длины.
+    """
+    if math.isnan(initial):
+        return pd.Series(values).ewm(alpha=alpha, adjust=False, ignore_na=True).mean().to_numpy()
+    extended = np.concatenate([[initial], values])
+    return pd.Series(extended).ewm(alpha=alpha, adjust=False, ignore_na=True).mean().to_numpy()[1:]
+
+
+class RollingWindow:
+    """
+    Скользящие показатели одного ряда: среднее, стандартное отклонение,
+    минимум, максимум, z-оценка относительно окна и EWMA.
+
+    Объект хранит последние window - 1 значений и последнее значение
+    EWMA, поэтому при добавлении новых значений (update) пересчитывается
+    только хвостовое окно, а не весь ряд.
+    """
+
+    def __init__(self, window: int, span: Optional[int] = None, min_periods: Optional[int] = None):
+        """
+        :param window: Размер окна (в строках).
+        :param span: Период EWMA (alpha = 2 / (span + 1)), по умолчанию равен window.
+        :param min_periods: Минимум непустых значений в окне (по умолчанию — window).
+        """
+        if window < 1:
+            raise ValueError("Размер окна должен быть положительным.")
+        self.window = window
+        self.min_periods = min_periods
+        self.alpha = 2 / ((span or window) + 1)
+        self.result = pd.DataFrame(columns=ROLLING_COLUMNS, dtype="float64")
+        self._tail = np.empty(0)
+        self._last_ewma = math.nan
+
+    def update(self, values: pd.Series) -> pd.DataFrame:
+        """
+        Добавляет значения в конец ряда.
+
+        :param values: Новые значения (индекс сохраняется в результате).
+        :return: Показатели для добавленных значений.
+        """
+        new = pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64")
+        extended = np.concatenate([self._tail, new])
+        skip = self._tail.size
+
+        mean = rolling_mean(extended, self.window, self.min_periods)[skip:]
+        std = rolling_std(extended, self.window, self.min_periods)[skip:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            zscore = np.where(std > 0, (new - mean) / std, np.nan)
+        smoothed = ewma(new, self.alpha, self._last_ewma)
+        frame = pd.DataFrame({
+            "rolling_mean": mean,
+            "rolling_std": std,
+            "rolling_min": rolling_min(extended, self.window, self.min_periods)[skip:],
+            "rolling_max": rolling_max(extended, self.window, self.min_periods)[skip:],
+            "zscore": zscore,
+            "ewma": smoothed,
+        }, index=values.index)
+
+        self._tail = extended[extended.size - (self.window - 1):] if self.window > 1 else np.empty(0)
+        if smoothed.size:
+            self._last_ewma = smoothed[-1]
+        self.result = frame if self.result.empty else pd.concat([self.result, frame])
+        return frame
@@ -0,0 +1,125 @@
+from typing import Any, Callable, Optional, Set
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class TaskSignals(QObject):
+    """Сигналы фоновой задачи (QRunnable не является QObject и не может их объявлять)."""
+
+    progress = Signal(int)
+    result = Signal(object)
+    error = Signal(object)
+    cancelled = Signal()
+    finished = Signal()
+
+
+class Task(QRunnable):
+    """
+    Фоновая задача: вызывает func(*args, **kwargs) в потоке из пула.
+
+    Результат, ошибка или отмена передаются сигналами, которые
+    доставляются в поток интерфейса. Если задача создана с with_hooks=True,
+    в func дополнительно передаются progress (сообщить процент
+    выполнения) и should_stop (проверить, не отменена ли задача).
+    """
+
+    def __init__(self, func: Callable[..., Any], *args, with_hooks: bool = False, **kwargs):
+        super().__init__()
+        # Временем жизни задачи управляет TaskRunner, а не пул потоков
+        self.setAutoDelete(False)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self._cancelled = False
+        if with_hooks:
+            self.kwargs.update(progress=self.report_progress, should_stop=self.is_cancelled)
+
+    def cancel(self) -> None:
+        """Запрашивает отмену задачи; функция задачи завершается при очередной проверке should_stop."""
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def report_progress(self, percent: int) -> None:
+        self.signals.progress.emit(int(percent))
+
+    def run(self) -> None:
+        """Выполняет задачу (вызывается пулом потоков)."""
+        try:
+            if self._cancelled:
+                self.signals.cancelled.emit()
+                return
+            try:
+                result = self.func(*self.args, **self.kwargs)
+            except Exception as e:
+                # Исключение, возникшее из-за отмены, ошибкой не считается
+                if self._cancelled:
+                    self.signals.cancelled.emit()
+                else:
+                    self.signals.error.emit(e)
+                return
+            if self._cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+class TaskRunner:
+    """Запускает задачи в QThreadPool и хранит ссылки на них до завершения."""
+
+    def __init__(self, pool: Optional[QThreadPool] = None):
+        self.pool = pool or QThreadPool()
+        self._tasks: Set[Task] = set()
+
+    def submit(
+        self, func: Callable[..., Any], *args,
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+        on_cancelled: Optional[Callable[[], None]] = None,
+        on_finished: Optional[Callable[[], None]] = None,
+        with_hooks: bool = False, **kwargs
+    ) -> Task:
+        """
+        Запускает func в фоновом потоке.
+
+        :param func: Выполняемая функция.
+        :param args: Позиционные аргументы функции.
+        :param on_result: Вызывается с результатом функции.
+        :param on_error: Вызывается с исключением, если функция завершилась ошибкой.
+        :param on_progress: Вызывается с процентом выполнения.
+        :param on_cancelled: Вызывается, если задача была отменена.
+        :param on_finished: Вызывается после завершения задачи в любом случае.
+        :param with_hooks: Передавать ли в функцию progress и should_stop.
+        :param kwargs: Именованные аргументы функции.
+        :return: Запущенная задача (для отмены).
+        """
+        task = Task(func, *args, with_hooks=with_hooks, **kwargs)
+        callbacks = [
+            (task.signals.result, on_result),
+            (task.signals.error, on_error),
+            (task.signals.progress, on_progress),
+            (task.signals.cancelled, on_cancelled),
+            (task.signals.finished, on_finished),
+        ]
+        for signal, callback in callbacks:
+            if callback is not None:
+                signal.connect(callback)
+        task.signals.finished.connect(lambda: self._tasks.discard(task))
+
+        self._tasks.add(task)
+        self.pool.start(task)
+        return task
+
+    def cancel_all(self) -> None:
+        """Отменяет все незавершенные задачи."""
+        for task in list(self._tasks):
+            task.cancel()
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """Ожидает завершения всех задач пула."""
+        return self.pool.waitForDone(timeout_ms)
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from rolling import RollingWindow, ewma, rolling_max, rolling_mean, rolling_min, rolling_std
+
+
+@pytest.fixture
+def values():
+    """Фикстура с рядом значений курса и пропусками."""
+    data = np.random.default_rng(2).normal(90, 3, 500)
+    data[[5, 6, 100]] = np.nan
+    return data
+
+
+@pytest.mark.parametrize("window, min_periods", [(1, None), (7, None), (30, 5), (1000, 1)])
+def test_rolling_matches_pandas(values, window, min_periods):
+    """Скользящие показатели совпадают с pandas rolling."""
+    expected = pd.Series(values).rolling(window, min_periods=min_periods)
+    np.testing.assert_allclose(rolling_mean(values, window, min_periods), expected.mean(), rtol=1e-9)
+    np.testing.assert_allclose(rolling_std(values, window, min_periods), expected.std(), rtol=1e-6)
+    np.testing.assert_array_equal(rolling_min(values, window, min_periods), expected.min())
+    np.testing.assert_array_equal(rolling_max(values, window, min_periods), expected.max())
+
+
+def test_ewma_matches_pandas(values):
+    """EWMA совпадает с ewm(adjust=False, ignore_na=True)."""
+    expected = pd.Series(values).ewm(span=10, adjust=False, ignore_na=True).mean()
+    np.testing.assert_allclose(ewma(values, 2 / 11), expected)
+
+
+def test_incremental_update_matches_full(values):
+    """Досчет по частям дает тот же результат, что и расчет по всему ряду."""
+    series = pd.Series(values)
+    full = RollingWindow(20).update(series)
+
+    engine = RollingWindow(20)
+    for start in range(0, len(series), 37):
+        engine.update(series.iloc[start:start + 37])
+    pd.testing.assert_frame_equal(engine.result, full, rtol=1e-6)
+
+
+def test_invalid_window():
+    """Окно должно быть положительным."""
+    with pytest.raises(ValueError):
+        RollingWindow(0)
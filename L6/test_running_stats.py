@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from running_stats import RunningStats
+
+
+@pytest.fixture
+def values():
+    """Фикстура с рядом значений курса и пропусками."""
+    data = np.random.default_rng(3).normal(90, 3, 10_000)
+    data[::97] = np.nan
+    return data
+
+
+def test_update_by_parts_matches_describe(values):
+    """Статистика, накопленная по частям и по одному значению, совпадает с describe."""
+    stats = RunningStats()
+    stats.update(values[:5000])
+    for value in values[5000:5100]:
+        stats.update(value)
+    stats.update(values[5100:])
+
+    expected = pd.Series(values).describe()
+    summary = stats.describe()
+    for name in ["count", "mean", "std", "min", "max"]:
+        assert summary[name] == pytest.approx(expected[name], rel=1e-9)
+    assert abs(np.nanmean(values <= summary["50%"]) - 0.5) < 0.02
+
+
+def test_merge(values):
+    """Объединение статистик частей равно статистике всех данных."""
+    left, right = RunningStats(), RunningStats()
+    left.update(values[:3000])
+    right.update(values[3000:])
+    merged = left.merge(right)
+    assert merged.count == np.count_nonzero(~np.isnan(values))
+    assert merged.variance == pytest.approx(np.nanvar(values, ddof=1))
+
+
+def test_empty_stats():
+    """Пустая статистика не падает и возвращает NaN."""
+    summary = RunningStats().describe()
+    assert summary["count"] == 0 and np.isnan(summary["mean"]) and np.isnan(summary["std"])
@@ -0,0 +1,55 @@
+from task_runner import Task
+
+
+def run_task(func, *args, **kwargs):
+    """Выполняет задачу синхронно и собирает испущенные сигналы."""
+    events = []
+    task = Task(func, *args, **kwargs)
+    task.signals.result.connect(lambda result: events.append(("result", result)))
+    task.signals.error.connect(lambda error: events.append(("error", error)))
+    task.signals.progress.connect(lambda percent: events.append(("progress", percent)))
+    task.signals.cancelled.connect(lambda: events.append(("cancelled", None)))
+    task.signals.finished.connect(lambda: events.append(("finished", None)))
+    return task, events
+
+
+def test_task_result():
+    """Результат функции передается сигналом result, затем finished."""
+    task, events = run_task(lambda a, b: a + b, 2, b=3)
+    task.run()
+    assert events == [("result", 5), ("finished", None)]
+
+
+def test_task_error():
+    """Исключение функции передается сигналом error."""
+    def fail():
+        raise ValueError("ошибка")
+
+    task, events = run_task(fail)
+    task.run()
+    assert events[0][0] == "error" and isinstance(events[0][1], ValueError)
+    assert events[-1] == ("finished", None)
+
+
+def test_task_hooks_progress_and_cancel():
+    """С with_hooks функция получает progress и should_stop; отмена не считается ошибкой."""
+    def work(progress, should_stop):
+        progress(50)
+        task.cancel()
+        if should_stop():
+            raise RuntimeError("прервано")
+        return "не должно вернуться"
+
+    task, events = run_task(work, with_hooks=True)
+    task.run()
+    assert events == [("progress", 50), ("cancelled", None), ("finished", None)]
+
+
+def test_task_cancelled_before_start():
+    """Задача, отмененная до запуска, функцию не вызывает."""
+    calls = []
+    task, events = run_task(lambda: calls.append(1))
+    task.cancel()
+    task.run()
+    assert calls == []
+    assert events == [("cancelled", None), ("finished", None)]
@@ -0,0 +1,23 @@
+
+import numpy as np
+import pytest
+import pandas as pd
+
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+from plot_canvas import PlotCanvas
+
+# Встроенный график: линии переиспользуются, повторный кадр с теми же осями — блиттинг
+def test_plot_canvas_updates_in_place():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    canvas = PlotCanvas()
+    df = pd.DataFrame({"дата": pd.date_range("2024-04-01", periods=30), "курс_usd": np.linspace(90, 95, 30)})
+    line = canvas.line
+
+    assert canvas.plot_line(df, "дата", "курс_usd", "Курс", "Дата", "Курс USD") is False
+    canvas.draw()
+    shifted = df.assign(курс_usd=df["курс_usd"][::-1].to_numpy())
+    assert canvas.plot_line(shifted, "дата", "курс_usd", "Курс", "Дата", "Курс USD") is True
+    assert canvas.line is line and canvas.line.get_ydata()[0] == 95
+
+    canvas.plot_histogram(df, "курс_usd", "Гистограмма", "Курс USD", "Частота")
+    assert sum(bar.get_height() for bar in canvas.bars) == 30 and not canvas.line.get_visible()
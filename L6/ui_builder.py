@@ -1,12 +1,15 @@
 from PySide6.QtWidgets import (
-    QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QWidget, QLabel, QFormLayout
+    QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QWidget, QLabel, QFormLayout, QProgressBar
 )
 from PySide6.QtCore import Qt
 
+from plot_canvas import PlotCanvas
+
 # Константы
 BUTTON_HEIGHT = 40
 LINE_EDIT_WIDTH = 200
 LABEL_STYLE = "font-size: 16px; font-weight: bold; margin-bottom: 5px;"
+PLOT_MIN_HEIGHT = 300
 
 
 class UIBuilder:
@@ -27,6 +30,8 @@ class UIBuilder:
             ("Диапазон дат", self._create_date_input),
             ("Ввод месяца", self._create_month_input),
             ("Действия", self._create_action_buttons),
+            ("Выполнение", self._create_task_controls),
+            ("График", self._create_plot_panel),
         ]
 
         for title, layout_func in groups:
@@ -90,6 +95,26 @@ class UIBuilder:
 
         return layout
 
+    def _create_task_controls(self) -> QHBoxLayout:
+        """Создает индикатор выполнения фоновой операции и кнопку отмены."""
+        self.task_progress_bar = QProgressBar()
+        self.task_progress_bar.setRange(0, 100)
+        self.task_progress_bar.setValue(0)
+        self.cancel_task_button = self._create_button("Отменить")
+
+        layout = QHBoxLayout()
+        layout.addWidget(self.task_progress_bar)
+        layout.addWidget(self.cancel_task_button)
+        return layout
+
+    def _create_plot_panel(self) -> QVBoxLayout:
+        """Создает встроенный график, который переиспользуется всеми действиями построения."""
+        self.plot_canvas = PlotCanvas()
+        self.plot_canvas.setMinimumHeight(PLOT_MIN_HEIGHT)
+        layout = QVBoxLayout()
+        layout.addWidget(self.plot_canvas)
+        return layout
+
     @staticmethod
     def _create_button(text: str, enabled: bool = False) -> QPushButton:
         """Создает кнопку."""